@@ -1,12 +1,5 @@
 """Backend package initialization"""
-from backend.scraper import (
-    fetch_from_multiple_sources,
-    parse_job_data_csv,
-    average_duplicate_majors,
-    save_to_json,
-)
-from backend.database import Database
-from backend.config import config
+import importlib
 
 __all__ = [
     "fetch_from_multiple_sources",
@@ -16,3 +9,23 @@ __all__ = [
     "Database",
     "config",
 ]
+
+# Exported name -> submodule providing it. Resolved on first access so that
+# importing one subpackage (e.g. the API) does not load the scraper stack.
+_LAZY_EXPORTS = {
+    "fetch_from_multiple_sources": "backend.scraper",
+    "parse_job_data_csv": "backend.scraper",
+    "average_duplicate_majors": "backend.scraper",
+    "save_to_json": "backend.scraper",
+    "Database": "backend.database",
+    "config": "backend.config",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
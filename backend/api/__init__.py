@@ -1,4 +1,17 @@
 """API package for Flask application"""
-from .app import app, create_app
+import importlib
+from .app import create_app
+
+# Importing the submodule binds `app` to it; drop that so `backend.api.app`
+# resolves to the Flask app (created on first access) through __getattr__
+del app
 
 __all__ = ['app', 'create_app']
+
+
+def __getattr__(name):
+    if name == 'app':
+        flask_app = importlib.import_module('.app', __name__).app
+        globals()['app'] = flask_app
+        return flask_app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
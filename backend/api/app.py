@@ -1,18 +1,39 @@
 """Flask application factory"""
+import time
+
+_import_started = time.perf_counter()
+
 from flask import Flask
 from flask_cors import CORS
 from .routes import register_routes
+from .startup import StartupTracker, start
+from ..config import config
+
+# Time spent importing Flask and the route modules, reported as a startup phase
+IMPORT_SECONDS = time.perf_counter() - _import_started
 
 
-def create_app():
+def create_app(startup_mode=None):
     """Create and configure Flask app"""
-    app = Flask(__name__)
-    CORS(app)
+    tracker = StartupTracker(config.API_STARTUP_MODE if startup_mode is None else startup_mode)
+    tracker.record("imports", IMPORT_SECONDS)
     
-    # Register routes
-    register_routes(app)
+    with tracker.phase("create_app"):
+        app = Flask(__name__)
+        CORS(app)
+        
+        # Register routes
+        register_routes(app)
+        app.extensions["startup"] = tracker
     
+    start(tracker)
     return app
 
 
-app = create_app()
+def __getattr__(name):
+    # `app` is created on first access (e.g. by a WSGI server), not at import
+    if name == "app":
+        global app
+        app = create_app()
+        return app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
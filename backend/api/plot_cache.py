@@ -0,0 +1,116 @@
+"""Two-tier (memory + disk) cache of rendered plot images"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Hashable, Optional
+from .cache import ResponseCache
+
+
+class PlotCache:
+    """
+    Caches rendered images keyed on data version plus render parameters.
+    Recent entries live in an in-memory LRU; every entry is also written
+    to `cache_dir` so renders survive restarts and are shared between
+    worker processes. Each entry carries a strong ETag (a hash of the
+    image bytes) and any metadata the caller stores with it. Entries in
+    both tiers expire after `ttl` seconds as a backstop to the version in
+    the key, and disk usage is bounded to `max_files` entries, oldest
+    removed first.
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 32, max_files: int = 64,
+                 ttl: float = 3600.0):
+        self.cache_dir = Path(cache_dir)
+        self.max_files = max_files
+        self.ttl = ttl
+        self._memory = ResponseCache(max_entries, ttl=ttl)
+        self._disk_lock = threading.Lock()
+        self.disk_hits = 0
+        self.renders = 0
+
+    @staticmethod
+    def _digest(key: Hashable) -> str:
+        return hashlib.sha256(repr(key).encode()).hexdigest()[:32]
+
+    def get(self, key: Hashable) -> Optional[Dict]:
+        """{'image', 'etag', 'meta'} for `key` from memory or disk, or None"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            return entry
+
+        base = self.cache_dir / self._digest(key)
+        try:
+            meta = json.loads(base.with_suffix(".json").read_text())
+            image = base.with_suffix(".img").read_bytes()
+        except (OSError, ValueError):
+            return None
+        if meta.get("key") != repr(key) or meta.get("etag") != _etag(image):
+            return None
+        # Wall-clock time, since disk entries outlive the process that wrote them
+        if time.time() - meta.get("created_at", 0) > self.ttl:
+            return None
+
+        entry = {"image": image, "etag": meta["etag"], "meta": meta.get("meta", {})}
+        self._memory.set(key, entry)
+        with self._disk_lock:
+            self.disk_hits += 1
+        return entry
+
+    def set(self, key: Hashable, image: bytes, meta: Optional[Dict] = None) -> Dict:
+        """Store a freshly rendered image; returns its cache entry"""
+        entry = {"image": image, "etag": _etag(image), "meta": meta or {}}
+        self._memory.set(key, entry)
+
+        base = self.cache_dir / self._digest(key)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Image first, metadata last: a reader only trusts a complete pair
+            for suffix, data in ((".img", image),
+                                 (".json", json.dumps({"key": repr(key), "etag": entry["etag"],
+                                                       "created_at": time.time(),
+                                                       "meta": entry["meta"]}).encode())):
+                staging = base.with_name(f"{base.name}{suffix}.{os.getpid()}.{threading.get_ident()}.tmp")
+                staging.write_bytes(data)
+                os.replace(staging, base.with_suffix(suffix))
+            self._prune()
+        except OSError as e:
+            print(f"⚠ Could not write plot cache entry: {e}")
+
+        with self._disk_lock:
+            self.renders += 1
+        return entry
+
+    def _prune(self) -> None:
+        """Drop the oldest entries on disk beyond max_files"""
+        with self._disk_lock:
+            entries = sorted(self.cache_dir.glob("*.img"), key=_mtime)
+            for image_path in entries[:max(len(entries) - self.max_files, 0)]:
+                for path in (image_path, image_path.with_suffix(".json")):
+                    try:
+                        path.unlink()
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict:
+        memory = self._memory.stats()
+        with self._disk_lock:
+            return {
+                "memory_entries": memory["entries"],
+                "memory_hits": memory["hits"],
+                "disk_hits": self.disk_hits,
+                "renders": self.renders,
+            }
+
+
+def _mtime(path: Path) -> float:
+    try:
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+def _etag(image: bytes) -> str:
+    return hashlib.sha256(image).hexdigest()[:32]
@@ -1,18 +1,35 @@
 """API routes for income analysis"""
-from flask import jsonify
+from flask import Response, current_app, jsonify, request, stream_with_context
 import io
+import csv
+import itertools
+import threading
+import time
 import base64
+import hashlib
 import json
 from pathlib import Path
-import matplotlib.pyplot as plt
-from matplotlib.ticker import FuncFormatter
-from ..database import Database
-from ..visualization import Plotter
+from urllib.parse import urlencode
+from concurrent.futures import Future
+from ..database import create_database
+from .cache import ResponseCache
+from .plot_cache import PlotCache
+from .search import MajorSearchIndex
+from ..visualization import get_render_service, RenderBusy, RenderTimeout
 from ..config import config
 
-# Initialize database with config settings
-db = Database(host=config.DB_HOST, user=config.DB_USER, 
-              password=config.DB_PASSWORD, database=config.DB_NAME)
+# Configured storage engine (config.DB_ENGINE), created on first use
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_db():
+    """Return the shared storage engine, creating it on first use"""
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = create_database()
+    return _db
 
 # Load jobs from JSON as fallback
 JOBS_FILE = Path(__file__).parent.parent.parent / "jobs.json"
@@ -28,135 +45,430 @@ def load_jobs_from_json():
     return None
 
 
+# Largest page /api/majors will return
+MAX_PAGE_SIZE = 500
+
+
+def parse_cursor(cursor):
+    """Turn an "income:id" page cursor into a tuple (None for the first page)"""
+    if not cursor:
+        return None
+    income, _, major_id = cursor.partition(':')
+    return int(income), int(major_id)
+
+
+# Cached read responses, keyed on the current data version
+response_cache = ResponseCache(config.RESPONSE_CACHE_MAX_ENTRIES, config.RESPONSE_CACHE_TTL)
+
+# Version of the data behind every cached response: income_stats.data_version,
+# which ingest bumps in the same transaction as any row it changes, or the
+# jobs.json mtime while serving the JSON fallback
+_data_version = None
+_version_checked_at = 0.0
+_version_lock = threading.Lock()
+
+
+def current_data_version():
+    """Return the current data version as a hashable cache-key component.
+    
+    The database is checked at most every DATA_VERSION_CHECK_INTERVAL
+    seconds, so cache hits normally never touch it.
+    """
+    global _data_version, _version_checked_at
+    now = time.monotonic()
+    if _data_version is not None and now - _version_checked_at < config.DATA_VERSION_CHECK_INTERVAL:
+        return _data_version
+    
+    with _version_lock:
+        if _data_version is not None and now - _version_checked_at < config.DATA_VERSION_CHECK_INTERVAL:
+            return _data_version
+        try:
+            stats = get_db().get_statistics()
+        except Exception as e:
+            print(f"⚠ Could not read data version: {e}")
+            stats = None
+        if stats and stats['total_majors']:
+            _data_version = ("database", stats['data_version'])
+        else:
+            _data_version = ("json", JOBS_FILE.stat().st_mtime_ns if JOBS_FILE.exists() else None)
+        _version_checked_at = now
+    return _data_version
+
+
+# Search index over major names, built on first search and rebuilt when
+# the data version changes
+search_index = None
+_search_lock = threading.Lock()
+
+
+def current_search_index():
+    """Return the search index, rebuilding it if the stored data has changed"""
+    global search_index
+    version = current_data_version()
+    index = search_index
+    if index is not None and index.version == version:
+        return index
+    
+    with _search_lock:
+        if search_index is None:
+            search_index = MajorSearchIndex()
+        index = search_index
+        if index.version != version:
+            if version[0] == "database":
+                try:
+                    rows = [(major, income) for batch in get_db().iter_all_majors(as_tuples=True)
+                            for _id, major, income, _timestamp in batch]
+                except Exception as e:
+                    # Keep serving the previous index; the next check retries the build
+                    print(f"⚠ Could not rebuild search index: {e}")
+                    return index
+                index.build(rows, version)
+                print(f"✓ Search index rebuilt with {len(rows)} majors (data version {version[1]})")
+            else:
+                jobs = load_jobs_from_json() or []
+                index.build([(job['major'], job['income']) for job in jobs], version)
+    return index
+
+
+def statistics_payload():
+    """Build the /api/statistics payload from database or JSON, with its status code"""
+    try:
+        stats = get_db().get_statistics()
+        
+        if stats:
+            # Got stats from database
+            top_majors = get_db().get_top_n_majors(10)
+            return {
+                "total_majors": stats['total_majors'],
+                "avg_income": round(float(stats['avg_income']), 2),
+                "max_income": stats['max_income'],
+                "min_income": stats['min_income'],
+                "top_majors": top_majors,
+                "source": "database"
+            }, 200
+        
+        # Fallback to JSON file
+        jobs = load_jobs_from_json()
+        if jobs:
+            incomes = [job['income'] for job in jobs]
+            top_10 = sorted(jobs, key=lambda x: x['income'], reverse=True)[:10]
+            
+            return {
+                "total_majors": len(jobs),
+                "avg_income": round(sum(incomes) / len(incomes), 2),
+                "max_income": max(incomes),
+                "min_income": min(incomes),
+                "top_majors": top_10,
+                "source": "json"
+            }, 200
+        
+        return {"error": "No data available"}, 404
+    
+    except Exception as e:
+        # Final fallback to JSON
+        jobs = load_jobs_from_json()
+        if jobs:
+            incomes = [job['income'] for job in jobs]
+            top_10 = sorted(jobs, key=lambda x: x['income'], reverse=True)[:10]
+            
+            return {
+                "total_majors": len(jobs),
+                "avg_income": round(sum(incomes) / len(incomes), 2),
+                "max_income": max(incomes),
+                "min_income": min(incomes),
+                "top_majors": top_10,
+                "source": "json"
+            }, 200
+        
+        return {"error": str(e)}, 500
+
+
+# Rendered plots, keyed on data version plus render parameters
+plot_cache = PlotCache(config.PLOT_CACHE_DIR, config.PLOT_CACHE_MAX_ENTRIES, config.PLOT_CACHE_MAX_FILES,
+                       config.PLOT_CACHE_TTL)
+_render_lock = threading.Lock()
+_renders_in_flight = {}
+
+# Default and largest figure size (inches) and resolution for /api/plot
+PLOT_DEFAULTS = {"width": 14.0, "height": 10.0, "dpi": 100}
+PLOT_LIMITS = {"width": 40.0, "height": 40.0, "dpi": 300}
+
+# Image formats served by /api/plot/image.<format>
+PLOT_MIMETYPES = {"png": "image/png", "svg": "image/svg+xml"}
+
+# Browser cache lifetime for image URLs pinned to a content version
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+
+def plot_params(args):
+    """(width, height, dpi) from request args, clamped to sane bounds"""
+    width = min(max(args.get('width', PLOT_DEFAULTS['width'], type=float), 2.0), PLOT_LIMITS['width'])
+    height = min(max(args.get('height', PLOT_DEFAULTS['height'], type=float), 2.0), PLOT_LIMITS['height'])
+    dpi = min(max(args.get('dpi', PLOT_DEFAULTS['dpi'], type=int), 50), PLOT_LIMITS['dpi'])
+    return width, height, dpi
+
+
+def load_plot_data():
+    """Majors and incomes to plot, highest income first, from database or JSON"""
+    # Stream compact rows from the database (already sorted by income descending)
+    majors = []
+    incomes_list = []
+    try:
+        for batch in get_db().iter_all_majors(as_tuples=True):
+            for _id, major, income, _timestamp in batch:
+                majors.append(major)
+                incomes_list.append(income)
+    except Exception as e:
+        # Never plot a partial table; use the JSON copy instead
+        print(f"⚠ Could not stream majors for plotting: {e}")
+        majors, incomes_list = [], []
+    
+    if not majors:
+        # Fallback to JSON
+        jobs = load_jobs_from_json()
+        if jobs:
+            # Sort by income descending
+            jobs = sorted(jobs, key=lambda x: x['income'], reverse=True)
+            majors = [job['major'] for job in jobs]
+            incomes_list = [job['income'] for job in jobs]
+    return majors, incomes_list
+
+
+def cached_plot(params, fmt="png"):
+    """Cache entry for the plot with `params` at the current data version, rendering on a miss"""
+    key = ("plot", current_data_version(), fmt) + tuple(params)
+    entry = plot_cache.get(key)
+    if entry is not None:
+        return entry
+    
+    # Single flight: concurrent misses for one key wait for a single render
+    with _render_lock:
+        flight = _renders_in_flight.get(key)
+        leader = flight is None
+        if leader:
+            flight = _renders_in_flight[key] = Future()
+    if not leader:
+        return flight.result()
+    
+    try:
+        entry = plot_cache.get(key)
+        if entry is None:
+            majors, incomes_list = load_plot_data()
+            if majors:
+                image = get_render_service().render(majors, incomes_list, *params, fmt=fmt)
+                entry = plot_cache.set(key, image, {"total_majors": len(majors)})
+        flight.set_result(entry)
+        return entry
+    except BaseException as e:
+        flight.set_exception(e)
+        raise
+    finally:
+        with _render_lock:
+            _renders_in_flight.pop(key, None)
+
+
+def render_error_response(error):
+    """503 with Retry-After when renders are backed up, 504 when one timed out"""
+    if isinstance(error, RenderBusy):
+        response = jsonify({"error": str(error)})
+        response.headers["Retry-After"] = "2"
+        return response, 503
+    return jsonify({"error": str(error)}), 504
+
+
 def register_routes(app):
     """Register all API routes with Flask app"""
     
     @app.route('/api/statistics', methods=['GET'])
     def get_statistics():
         """Retrieve income statistics from database or JSON"""
+        key = ("statistics", current_data_version())
+        payload = response_cache.get(key)
+        if payload is not None:
+            return jsonify(payload), 200
+        
+        payload, status = statistics_payload()
+        if status == 200:
+            response_cache.set(key, payload)
+        return jsonify(payload), status
+    
+    @app.route('/api/cache/stats', methods=['GET'])
+    def get_cache_stats():
+        """Response cache hit/miss counters"""
+        return jsonify({"data_version": current_data_version(), **response_cache.stats(),
+                        "plots": plot_cache.stats(), "renders": get_render_service().stats()}), 200
+    
+    @app.route('/api/majors', methods=['GET'])
+    def get_majors():
+        """Page through majors by income; pass back `next_cursor` as ?cursor= for the next page"""
         try:
-            stats = db.get_statistics()
-            
-            if stats:
-                # Got stats from database
-                top_majors = db.get_top_n_majors(10)
-                return jsonify({
-                    "total_majors": stats['total_majors'],
-                    "avg_income": round(float(stats['avg_income']), 2),
-                    "max_income": stats['max_income'],
-                    "min_income": stats['min_income'],
-                    "top_majors": top_majors,
-                    "source": "database"
-                }), 200
+            limit = min(max(request.args.get('limit', 50, type=int), 1), MAX_PAGE_SIZE)
+            min_income = request.args.get('min_income', type=int)
+            max_income = request.args.get('max_income', type=int)
+            after = parse_cursor(request.args.get('cursor'))
+        except ValueError:
+            return jsonify({"error": "Invalid cursor"}), 400
+        
+        key = ("majors", limit, after, min_income, max_income, current_data_version())
+        payload = response_cache.get(key)
+        if payload is not None:
+            return jsonify(payload), 200
+        
+        page = get_db().get_majors_page(limit, after=after, min_income=min_income, max_income=max_income)
+        if page is None:
+            return jsonify({"error": "Database unavailable"}), 503
+        
+        next_cursor = page['next_cursor']
+        payload = {
+            "majors": page['majors'],
+            "next_cursor": f"{next_cursor[0]}:{next_cursor[1]}" if next_cursor else None
+        }
+        response_cache.set(key, payload)
+        return jsonify(payload), 200
+
+    @app.route('/api/majors/search', methods=['GET'])
+    def search_majors():
+        """Prefix, word and substring search over major names (autocomplete)"""
+        query = request.args.get('q', '').strip()
+        limit = min(max(request.args.get('limit', 10, type=int), 1), MAX_PAGE_SIZE)
+        if not query:
+            return jsonify({"error": "Missing search query ?q="}), 400
+        
+        results = current_search_index().search(query, limit)
+        return jsonify({"query": query, "results": results}), 200
+
+    @app.route('/api/majors/<path:major>/history', methods=['GET'])
+    def get_major_history(major):
+        """Income of one major across scrape runs"""
+        history = get_db().get_major_history(major)
+        if history is None:
+            return jsonify({"error": "Database unavailable"}), 503
+        if not history:
+            return jsonify({"error": f"No history for {major}"}), 404
+        return jsonify({"major": major, "history": history}), 200
+
+    @app.route('/api/plot', methods=['GET'])
+    def get_plot():
+        """Return the plot as a base64 encoded image (prefer /api/plot/meta + the image URL)"""
+        try:
+            params = plot_params(request.args)
+            entry = cached_plot(params)
+            if entry is None:
+                return jsonify({"error": "No data available for plotting"}), 404
             
-            # Fallback to JSON file
-            jobs = load_jobs_from_json()
-            if jobs:
-                incomes = [job['income'] for job in jobs]
-                top_10 = sorted(jobs, key=lambda x: x['income'], reverse=True)[:10]
-                
-                return jsonify({
-                    "total_majors": len(jobs),
-                    "avg_income": round(sum(incomes) / len(incomes), 2),
-                    "max_income": max(incomes),
-                    "min_income": min(incomes),
-                    "top_majors": top_10,
-                    "source": "json"
-                }), 200
+            if "json_body" not in entry:
+                img_base64 = base64.b64encode(entry["image"]).decode()
+                body = json.dumps({
+                    "image": f"data:image/png;base64,{img_base64}",
+                    "total_majors": entry["meta"]["total_majors"]
+                })
+                entry["json_etag"] = hashlib.sha256(body.encode()).hexdigest()[:32]
+                entry["json_body"] = body
             
-            return jsonify({"error": "No data available"}), 404
+            response = Response(entry["json_body"], mimetype="application/json")
+            response.set_etag(entry["json_etag"])
+            # Let browsers keep the image but revalidate it (cheap 304s)
+            response.headers["Cache-Control"] = "no-cache"
+            return response.make_conditional(request)
         
+        except (RenderBusy, RenderTimeout) as e:
+            return render_error_response(e)
         except Exception as e:
-            # Final fallback to JSON
-            jobs = load_jobs_from_json()
-            if jobs:
-                incomes = [job['income'] for job in jobs]
-                top_10 = sorted(jobs, key=lambda x: x['income'], reverse=True)[:10]
-                
-                return jsonify({
-                    "total_majors": len(jobs),
-                    "avg_income": round(sum(incomes) / len(incomes), 2),
-                    "max_income": max(incomes),
-                    "min_income": min(incomes),
-                    "top_majors": top_10,
-                    "source": "json"
-                }), 200
-            
             return jsonify({"error": str(e)}), 500
 
-    @app.route('/api/plot', methods=['GET'])
-    def get_plot():
-        """Generate and return plot as base64 encoded image"""
+    @app.route('/api/plot/image.<fmt>', methods=['GET'])
+    def get_plot_image(fmt):
+        """Serve the plot as raw image bytes with ETag and cache headers"""
+        if fmt not in PLOT_MIMETYPES:
+            return jsonify({"error": f"Unsupported format {fmt!r}"}), 404
         try:
-            # Try to fetch from database first
-            all_majors = db.get_all_majors()
+            entry = cached_plot(plot_params(request.args), fmt)
+            if entry is None:
+                return jsonify({"error": "No data available for plotting"}), 404
             
-            if all_majors:
-                jobs = [
-                    {"major": major['major'], "income": major['income']}
-                    for major in all_majors
-                ]
+            response = Response(entry["image"], mimetype=PLOT_MIMETYPES[fmt])
+            response.set_etag(entry["etag"])
+            if request.args.get('v') == entry["etag"]:
+                # URL is pinned to this exact content, so it can never go stale
+                response.headers["Cache-Control"] = f"public, max-age={IMMUTABLE_MAX_AGE}, immutable"
             else:
-                # Fallback to JSON
-                jobs = load_jobs_from_json()
-                if not jobs:
-                    return jsonify({"error": "No data available for plotting"}), 404
-            
-            # Create plotter and set bounds
-            plotter = Plotter(jobs)
-            
-            # Get min and max income for dynamic bounds
-            incomes = [job['income'] for job in jobs]
-            min_income = min(incomes)
-            max_income = max(incomes)
-            
-            plotter.set_income_bounds(min_income, max_income)
-            
-            # Create the plot
-            filtered_jobs = [
-                job for job in jobs 
-                if plotter.lower_income_bound <= job['income'] <= plotter.upper_income_bound
-            ]
-            
-            if not filtered_jobs:
-                return jsonify({"error": "No jobs in income range"}), 404
-            
-            # Sort by income descending
-            filtered_jobs.sort(key=lambda x: x['income'], reverse=True)
-            
-            # Extract data
-            majors = [job['major'] for job in filtered_jobs]
-            incomes_list = [job['income'] for job in filtered_jobs]
-            
-            # Create figure
-            fig, ax = plt.subplots(figsize=(14, 10))
-            ax.barh(majors, incomes_list, color='steelblue')
-            ax.set_xlabel('Median Income ($)', fontsize=12)
-            ax.set_ylabel('Major', fontsize=12)
-            ax.set_title('College Majors by Income', fontsize=14, fontweight='bold')
-            ax.invert_yaxis()  # Highest income at top
-            
-            # Format x-axis as currency
-            ax.xaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
-            
-            plt.tight_layout()
-            
-            # Convert to base64
-            img = io.BytesIO()
-            plt.savefig(img, format='png', dpi=100, bbox_inches='tight')
-            img.seek(0)
-            img_base64 = base64.b64encode(img.getvalue()).decode()
-            plt.close()
+                response.headers["Cache-Control"] = "no-cache"
+            return response.make_conditional(request)
+        
+        except (RenderBusy, RenderTimeout) as e:
+            return render_error_response(e)
+        except Exception as e:
+            return jsonify({"error": str(e)}), 500
+    
+    @app.route('/api/plot/meta', methods=['GET'])
+    def get_plot_meta():
+        """Image URL and metadata for the current plot, without the image itself"""
+        fmt = request.args.get('format', 'png')
+        if fmt not in PLOT_MIMETYPES:
+            return jsonify({"error": f"Unsupported format {fmt!r}"}), 400
+        try:
+            width, height, dpi = plot_params(request.args)
+            entry = cached_plot((width, height, dpi), fmt)
+            if entry is None:
+                return jsonify({"error": "No data available for plotting"}), 404
             
+            query = urlencode({"width": width, "height": height, "dpi": dpi, "v": entry["etag"]})
             return jsonify({
-                "image": f"data:image/png;base64,{img_base64}",
-                "total_majors": len(filtered_jobs)
+                "url": f"/api/plot/image.{fmt}?{query}",
+                "format": fmt,
+                "content_type": PLOT_MIMETYPES[fmt],
+                "bytes": len(entry["image"]),
+                "etag": entry["etag"],
+                "width": width,
+                "height": height,
+                "dpi": dpi,
+                "total_majors": entry["meta"]["total_majors"]
             }), 200
         
+        except (RenderBusy, RenderTimeout) as e:
+            return render_error_response(e)
         except Exception as e:
             return jsonify({"error": str(e)}), 500
 
+    @app.route('/api/majors/export', methods=['GET'])
+    def export_majors():
+        """Stream all majors as CSV without loading the table into memory"""
+        batches = get_db().iter_all_majors(as_tuples=True)
+        try:
+            # Fetch the first batch up front so an unavailable database is a 503
+            first = next(batches, None)
+        except Exception as e:
+            return jsonify({"error": f"Database unavailable: {e}"}), 503
+        
+        def generate():
+            out = io.StringIO()
+            writer = csv.writer(out)
+            writer.writerow(["id", "major", "income", "timestamp"])
+            try:
+                for batch in itertools.chain([first] if first else [], batches):
+                    writer.writerows(batch)
+                    yield out.getvalue()
+                    out.seek(0)
+                    out.truncate(0)
+            except Exception as e:
+                # Headers are already sent: mark the file as incomplete, then abort
+                # the response so the client sees a broken transfer, not a short file
+                yield f"{out.getvalue()}# ERROR: export truncated: {e}\n"
+                raise
+            if out.getvalue():
+                yield out.getvalue()
+        
+        return Response(stream_with_context(generate()), mimetype="text/csv", headers={
+            "Content-Disposition": "attachment; filename=income_by_major.csv"
+        })
+
     @app.route('/api/health', methods=['GET'])
     def health_check():
         """Health check endpoint"""
         return jsonify({"status": "API is running"}), 200
+    
+    @app.route('/api/ready', methods=['GET'])
+    def readiness_check():
+        """Readiness: 200 once startup warmup has finished, 503 before, with phase timings"""
+        report = current_app.extensions["startup"].report()
+        return jsonify(report), 200 if report["ready"] else 503
@@ -0,0 +1,115 @@
+"""In-process prefix, token and substring search over major names"""
+import bisect
+import re
+import threading
+from typing import Dict, Hashable, Iterable, List, Optional, Set, Tuple
+from ..utils import normalize_major
+
+TOKEN_PATTERN = re.compile(r"[A-Z0-9]+")
+
+# Match ranks, best first
+EXACT, PREFIX, TOKEN_PREFIX, SUBSTRING = range(4)
+MATCH_NAMES = ("exact", "prefix", "token", "substring")
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _prefix_range(keys: List[str], prefix: str) -> Tuple[int, int]:
+    """Index range of the sorted `keys` that start with `prefix`"""
+    start = bisect.bisect_left(keys, prefix)
+    end = bisect.bisect_left(keys, prefix + "\uffff", start)
+    return start, end
+
+
+class MajorSearchIndex:
+    """
+    Immutable-after-build search structures over (major, income) rows:
+    a sorted name list for whole-name prefixes, a sorted token list for
+    per-word prefixes ("comp eng" finds COMPUTER ENGINEERING) and a
+    trigram posting map for substrings. Matches are ranked exact, prefix,
+    token prefix, substring, then by income. `version` records the data
+    version the index was built from so callers can rebuild on change.
+    """
+
+    def __init__(self):
+        self.version: Optional[Hashable] = None
+        self._majors: List[str] = []
+        self._normalized: List[str] = []
+        self._incomes: List[int] = []
+        self._names: List[Tuple[str, int]] = []
+        self._tokens: List[Tuple[str, int]] = []
+        self._token_keys: List[str] = []
+        self._name_keys: List[str] = []
+        self._trigrams: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+
+    def build(self, rows: Iterable[Tuple[str, int]], version: Hashable) -> "MajorSearchIndex":
+        """Replace the index contents with `rows` built for `version`"""
+        majors, normalized, incomes, tokens = [], [], [], []
+        trigrams: Dict[str, Set[int]] = {}
+        for major, income in rows:
+            i = len(majors)
+            name = normalize_major(major)
+            majors.append(major)
+            normalized.append(name)
+            incomes.append(income)
+            tokens.extend((token, i) for token in set(TOKEN_PATTERN.findall(name)))
+            for gram in _trigrams(name):
+                trigrams.setdefault(gram, set()).add(i)
+        names = sorted((name, i) for i, name in enumerate(normalized))
+        tokens.sort()
+
+        with self._lock:
+            self._majors, self._normalized, self._incomes = majors, normalized, incomes
+            self._names, self._name_keys = names, [name for name, _ in names]
+            self._tokens, self._token_keys = tokens, [token for token, _ in tokens]
+            self._trigrams = trigrams
+            self.version = version
+        return self
+
+    def __len__(self) -> int:
+        return len(self._majors)
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Best `limit` majors matching `query` as {'major', 'income', 'match'} dicts"""
+        q = normalize_major(query)
+        if not q:
+            return []
+        with self._lock:
+            majors, normalized, incomes = self._majors, self._normalized, self._incomes
+            names, name_keys = self._names, self._name_keys
+            tokens, token_keys = self._tokens, self._token_keys
+            trigrams = self._trigrams
+
+        ranks: Dict[int, int] = {}
+
+        start, end = _prefix_range(name_keys, q)
+        for name, i in names[start:end]:
+            ranks[i] = EXACT if name == q else PREFIX
+
+        query_tokens = TOKEN_PATTERN.findall(q)
+        if query_tokens:
+            matched: Optional[Set[int]] = None
+            for token in query_tokens:
+                start, end = _prefix_range(token_keys, token)
+                ids = {i for _, i in tokens[start:end]}
+                matched = ids if matched is None else matched & ids
+                if not matched:
+                    break
+            for i in matched or ():
+                ranks.setdefault(i, TOKEN_PREFIX)
+
+        if len(q) >= 3:
+            postings = sorted((trigrams.get(gram, set()) for gram in _trigrams(q)), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+            for i in candidates:
+                if i not in ranks and q in normalized[i]:
+                    ranks[i] = SUBSTRING
+
+        best = sorted(ranks.items(), key=lambda item: (item[1], -incomes[item[0]], majors[item[0]]))
+        return [
+            {"major": majors[i], "income": incomes[i], "match": MATCH_NAMES[rank]}
+            for i, rank in best[:limit]
+        ]
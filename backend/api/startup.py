@@ -0,0 +1,108 @@
+"""Startup modes, background warmup and per-phase startup timings"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from ..config import config
+
+STARTUP_MODES = ("lazy", "warm", "eager")
+
+
+class StartupTracker:
+    """
+    Records how long each startup phase took and whether the app is ready.
+
+    In "lazy" mode the app is ready as soon as it is created and every
+    resource loads on first use. "warm" loads the DB pool, data snapshot
+    and render workers on a background thread and reports ready when it
+    finishes; "eager" does the same before create_app returns.
+    """
+
+    def __init__(self, mode: str):
+        if mode not in STARTUP_MODES:
+            raise ValueError(f"Unknown API_STARTUP_MODE {mode!r}, expected one of {', '.join(STARTUP_MODES)}")
+        self.mode = mode
+        self.phases: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+        self._ready_after: Optional[float] = None
+
+    @contextmanager
+    def phase(self, name: str, required: bool = True):
+        """Time a startup phase; failures of optional phases are recorded, not raised"""
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            with self._lock:
+                self.errors[name] = str(e)
+            print(f"⚠ Startup phase {name} failed: {e}")
+            if required:
+                raise
+        finally:
+            self.record(name, time.perf_counter() - started)
+
+    def record(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.phases[name] = seconds
+        print(f"✓ Startup phase {name}: {seconds * 1000:.1f}ms")
+
+    def mark_ready(self) -> None:
+        with self._lock:
+            self._ready_after = time.perf_counter() - self._started
+        self._ready.set()
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def report(self) -> Dict:
+        with self._lock:
+            return {
+                "mode": self.mode,
+                "ready": self._ready.is_set(),
+                "ready_after_ms": None if self._ready_after is None else round(self._ready_after * 1000, 1),
+                "phases_ms": {name: round(seconds * 1000, 1) for name, seconds in self.phases.items()},
+                "errors": dict(self.errors),
+            }
+
+
+def warm_up(tracker: StartupTracker) -> None:
+    """Load the lazily initialised resources ahead of the first request"""
+    from . import routes
+    from ..visualization import get_render_service
+
+    with tracker.phase("db_pool", required=False):
+        storage = routes.get_db()
+        pool = getattr(storage, "pool", None)
+        if pool is not None:
+            pool.fill()
+        else:
+            with storage.connection() as conn:
+                if conn is None:
+                    raise RuntimeError("database unavailable")
+
+    with tracker.phase("data_snapshot", required=False):
+        payload, status = routes.statistics_payload()
+        if status == 200:
+            routes.response_cache.set(("statistics", routes.current_data_version()), payload)
+        routes.current_search_index()
+
+    if config.API_WARM_RENDERERS:
+        with tracker.phase("render_pool", required=False):
+            # One worker serves the first plot; the rest start on demand
+            get_render_service().warm(1)
+
+    tracker.mark_ready()
+
+
+def start(tracker: StartupTracker) -> None:
+    """Run the warmup for the tracker's mode"""
+    if tracker.mode == "lazy":
+        tracker.mark_ready()
+    elif tracker.mode == "eager":
+        warm_up(tracker)
+    else:
+        threading.Thread(target=warm_up, args=(tracker,), name="api-warmup", daemon=True).start()
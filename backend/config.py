@@ -1,5 +1,6 @@
 """Backend configuration"""
 import os
+from pathlib import Path
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -10,16 +11,82 @@ class Config:
     """Application configuration"""
     
     # Database settings
+    # Storage engine: "mysql" or "sqlite" (embedded, no server needed)
+    DB_ENGINE = os.getenv("DB_ENGINE", "mysql")
+    SQLITE_PATH = os.getenv("SQLITE_PATH", str(Path(__file__).parent.parent / "data" / "income_major.db"))
+    SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", 10))
+    SQLITE_POOL_SIZE = int(os.getenv("SQLITE_POOL_SIZE", 4))
     DB_HOST = os.getenv("DB_HOST", "localhost")
     DB_USER = os.getenv("DB_USER", "root")
     DB_PASSWORD = os.getenv("MY_SQL_PASSWORD", "root")
     DB_NAME = os.getenv("DB_NAME", "income_major_db")
+    DB_POOL_MIN_SIZE = int(os.getenv("DB_POOL_MIN_SIZE", 1))
+    DB_POOL_MAX_SIZE = int(os.getenv("DB_POOL_MAX_SIZE", 10))
+    DB_POOL_MAX_IDLE = float(os.getenv("DB_POOL_MAX_IDLE", 300))
+    DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", 10))
+    DB_BATCH_SIZE = int(os.getenv("DB_BATCH_SIZE", 1000))
+    DB_STREAM_BATCH_SIZE = int(os.getenv("DB_STREAM_BATCH_SIZE", 1000))
+    # "sync" writes only changed rows, "full" rewrites every row
+    DB_WRITE_MODE = os.getenv("DB_WRITE_MODE", "sync")
+    DB_SYNC_DELETE_MISSING = os.getenv("DB_SYNC_DELETE_MISSING", "False") == "True"
+    # Append each run's full snapshot to income_history (opt-in: every run
+    # writes one history row per major, even when nothing changed)
+    DB_RECORD_HISTORY = os.getenv("DB_RECORD_HISTORY", "False") == "True"
+    
+    # Scraper settings
+    SCRAPER_MAX_WORKERS = int(os.getenv("SCRAPER_MAX_WORKERS", 4))
+    SCRAPER_DEADLINE = float(os.getenv("SCRAPER_DEADLINE", 60))
+    SCRAPER_TIMEOUT = float(os.getenv("SCRAPER_TIMEOUT", 10))
+    SCRAPER_HOST_CONCURRENCY = int(os.getenv("SCRAPER_HOST_CONCURRENCY", 2))
+    SCRAPER_HOST_RATE = float(os.getenv("SCRAPER_HOST_RATE", 5))
+    SCRAPER_RETRIES = int(os.getenv("SCRAPER_RETRIES", 3))
+    SCRAPER_BACKOFF_BASE = float(os.getenv("SCRAPER_BACKOFF_BASE", 0.5))
+    SCRAPER_BACKOFF_MAX = float(os.getenv("SCRAPER_BACKOFF_MAX", 8))
+    SCRAPER_BREAKER_THRESHOLD = int(os.getenv("SCRAPER_BREAKER_THRESHOLD", 5))
+    SCRAPER_BREAKER_RESET = float(os.getenv("SCRAPER_BREAKER_RESET", 60))
+    SCRAPER_HEDGE = os.getenv("SCRAPER_HEDGE", "True") == "True"
+    SCRAPER_HEDGE_DELAY = float(os.getenv("SCRAPER_HEDGE_DELAY", 2))
+    SCRAPER_PARSE_WORKERS = int(os.getenv("SCRAPER_PARSE_WORKERS", os.cpu_count() or 1))
+    SCRAPER_PARALLEL_MIN_BYTES = int(os.getenv("SCRAPER_PARALLEL_MIN_BYTES", 64 * 1024 * 1024))
+    SCRAPER_CACHE_ENABLED = os.getenv("SCRAPER_CACHE_ENABLED", "True") == "True"
+    SCRAPER_CACHE_DIR = os.getenv(
+        "SCRAPER_CACHE_DIR", str(Path(__file__).parent.parent / ".cache" / "http")
+    )
+    
+    # Offline replay of recorded sources (see backend/scraper/replay.py)
+    SCRAPER_REPLAY_DIR = os.getenv("SCRAPER_REPLAY_DIR", "")
+    SCRAPER_REPLAY_URL = os.getenv("SCRAPER_REPLAY_URL", "")
+    SCRAPER_REPLAY_LATENCY = float(os.getenv("SCRAPER_REPLAY_LATENCY", 0))
+    SCRAPER_REPLAY_BANDWIDTH = int(os.getenv("SCRAPER_REPLAY_BANDWIDTH", 0))
+    SCRAPER_REPLAY_FAILURE_RATE = float(os.getenv("SCRAPER_REPLAY_FAILURE_RATE", 0))
+    
+    # Response cache for read endpoints, keyed on income_stats.data_version
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", 300))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", 256))
+    
+    # Rendered plot cache: in-memory LRU plus files under PLOT_CACHE_DIR
+    PLOT_CACHE_DIR = os.getenv("PLOT_CACHE_DIR", str(Path(__file__).parent.parent / ".cache" / "plots"))
+    PLOT_CACHE_MAX_ENTRIES = int(os.getenv("PLOT_CACHE_MAX_ENTRIES", 32))
+    PLOT_CACHE_MAX_FILES = int(os.getenv("PLOT_CACHE_MAX_FILES", 64))
+    PLOT_CACHE_TTL = float(os.getenv("PLOT_CACHE_TTL", 3600))
+    
+    # Plot render worker processes, queue bound and timeouts (seconds)
+    RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", min(os.cpu_count() or 1, 4)))
+    RENDER_MAX_PENDING = int(os.getenv("RENDER_MAX_PENDING", 8))
+    RENDER_TIMEOUT = float(os.getenv("RENDER_TIMEOUT", 30))
+    RENDER_QUEUE_TIMEOUT = float(os.getenv("RENDER_QUEUE_TIMEOUT", 2))
+    
+    # Seconds between data-version checks (response, plot and search caches)
+    DATA_VERSION_CHECK_INTERVAL = float(os.getenv("DATA_VERSION_CHECK_INTERVAL", 5))
     
     # Flask settings
     DEBUG = os.getenv("DEBUG", "True") == "True"
     TESTING = os.getenv("TESTING", "False") == "True"
     
     # API settings
+    # "lazy" (load on first use), "warm" (background warmup) or "eager"
+    API_STARTUP_MODE = os.getenv("API_STARTUP_MODE", "warm")
+    API_WARM_RENDERERS = os.getenv("API_WARM_RENDERERS", "True") == "True"
     API_HOST = os.getenv("API_HOST", "127.0.0.1")
     API_PORT = int(os.getenv("API_PORT", 5000))
 
@@ -6,4 +6,63 @@ CREATE TABLE income_by_major (
     timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
     INDEX idx_income (income),
     INDEX idx_timestamp (timestamp)
-);
\ No newline at end of file
+);
+
+-- Migration 001: keyset pagination on (income DESC, id) --
+-- Covering index so top-N and income-range pages are index-only scans
+-- and a deep page seeks straight to its cursor. It supersedes idx_income.
+ALTER TABLE income_by_major
+    DROP INDEX idx_income,
+    ADD INDEX idx_income_id (income DESC, id, major, timestamp);
+
+
+-- Migration 002: statistics summary maintained at ingest time --
+-- A single row (id = 1) updated in the same transaction as every write to
+-- income_by_major, so statistics are a primary-key lookup. data_version is
+-- bumped on each change.
+CREATE TABLE income_stats (
+    id TINYINT PRIMARY KEY,
+    total_majors INT NOT NULL DEFAULT 0,
+    income_sum BIGINT NOT NULL DEFAULT 0,
+    min_income INT NULL,
+    max_income INT NULL,
+    data_version BIGINT NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+
+INSERT INTO income_stats (id, total_majors, income_sum, min_income, max_income, data_version)
+SELECT 1, COUNT(*), COALESCE(SUM(income), 0), MIN(income), MAX(income), 1
+FROM income_by_major;
+
+
+-- Migration 003: scrape-run history --
+-- income_by_major stays the compact "latest" table; every run also appends
+-- a full snapshot to income_history. History is range-partitioned by run
+-- date and clustered on (major, run_date, run_id), so a major's time series
+-- is one ordered index range per partition and date-bounded queries prune
+-- whole partitions. Add yearly partitions by splitting p_future with
+-- ALTER TABLE income_history REORGANIZE PARTITION p_future INTO (...).
+CREATE TABLE scrape_runs (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    run_date DATE NOT NULL,
+    started_at DATETIME NOT NULL,
+    finished_at DATETIME NULL,
+    total_majors INT NOT NULL DEFAULT 0,
+    INDEX idx_run_date (run_date)
+);
+
+CREATE TABLE income_history (
+    run_id INT NOT NULL,
+    run_date DATE NOT NULL,
+    major VARCHAR(255) NOT NULL,
+    income INT NOT NULL,
+    PRIMARY KEY (major, run_date, run_id),
+    INDEX idx_run (run_id)
+)
+PARTITION BY RANGE COLUMNS (run_date) (
+    PARTITION p2025 VALUES LESS THAN ('2026-01-01'),
+    PARTITION p2026 VALUES LESS THAN ('2027-01-01'),
+    PARTITION p2027 VALUES LESS THAN ('2028-01-01'),
+    PARTITION p2028 VALUES LESS THAN ('2029-01-01'),
+    PARTITION p_future VALUES LESS THAN (MAXVALUE)
+);
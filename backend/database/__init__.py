@@ -1,4 +1,25 @@
 """Database package for college major data"""
-from .db import Database
+import importlib
+from .base import Storage
+from .factory import create_database
 
-__all__ = ['Database']
+__all__ = ['Storage', 'Database', 'SQLiteDatabase', 'AsyncDatabase', 'create_database',
+           'ConnectionPool', 'PoolTimeout']
+
+# Engine classes load their drivers (PyMySQL, asyncio) on first access only
+_LAZY_EXPORTS = {
+    'Database': '.db',
+    'SQLiteDatabase': '.sqlite_db',
+    'AsyncDatabase': '.async_db',
+    'ConnectionPool': '.pool',
+    'PoolTimeout': '.pool',
+}
+
+
+def __getattr__(name):
+    module = _LAZY_EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
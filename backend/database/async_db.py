@@ -0,0 +1,149 @@
+"""Asyncio access to a storage engine via a bounded thread pool"""
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+from .base import Storage
+from .factory import create_database
+from ..config import config
+
+# Batches buffered ahead of an async consumer when streaming
+STREAM_QUEUE_SIZE = 2
+
+
+class AsyncDatabase:
+    """
+    Awaitable counterpart to a Storage engine. Each call runs the blocking
+    engine method on a dedicated thread pool sized to the connection pool,
+    so independent queries can overlap with asyncio.gather:
+
+        stats, top = await asyncio.gather(adb.get_statistics(), adb.get_top_n_majors(10))
+
+    Each call still checks out its own pooled connection (or, for SQLite,
+    uses its worker thread's connection), so concurrency is bounded by
+    `max_workers` rather than by the event loop.
+    """
+
+    def __init__(self, storage: Optional[Storage] = None, max_workers: Optional[int] = None):
+        self.storage = create_database() if storage is None else storage
+        self.max_workers = config.DB_POOL_MAX_SIZE if max_workers is None else max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max(self.max_workers, 1),
+                                            thread_name_prefix="async-db")
+
+    async def _run(self, method: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, functools.partial(method, *args, **kwargs))
+
+    async def close(self) -> None:
+        """Close the engine's connections and stop the worker threads."""
+        await self._run(self.storage.close)
+        self._executor.shutdown(wait=False)
+
+    async def __aenter__(self) -> "AsyncDatabase":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def insert_majors(self, jobs: List[Dict], batch_size: Optional[int] = None) -> bool:
+        return await self._run(self.storage.insert_majors, jobs, batch_size)
+
+    async def bulk_upsert_majors(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        return await self._run(self.storage.bulk_upsert_majors, jobs, batch_size)
+
+    async def sync_majors(self, jobs: List[Dict], delete_missing: bool = False,
+                          batch_size: Optional[int] = None) -> Optional[Dict]:
+        return await self._run(self.storage.sync_majors, jobs, delete_missing, batch_size)
+
+    async def record_snapshot(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Optional[int]:
+        return await self._run(self.storage.record_snapshot, jobs, batch_size)
+
+    async def get_scrape_runs(self, limit: int = 50) -> Optional[List[Dict]]:
+        return await self._run(self.storage.get_scrape_runs, limit)
+
+    async def get_major_history(self, major_name: str, since: Optional[date] = None,
+                                until: Optional[date] = None) -> Optional[List[Dict]]:
+        return await self._run(self.storage.get_major_history, major_name, since, until)
+
+    async def get_run_snapshot(self, run_id: int) -> Optional[List[Dict]]:
+        return await self._run(self.storage.get_run_snapshot, run_id)
+
+    async def get_all_majors(self) -> Optional[List[Dict]]:
+        return await self._run(self.storage.get_all_majors)
+
+    async def get_top_n_majors(self, n: int = 10,
+                               after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        return await self._run(self.storage.get_top_n_majors, n, after)
+
+    async def get_majors_by_income_range(self, min_income: int, max_income: int,
+                                         limit: Optional[int] = None,
+                                         after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        return await self._run(self.storage.get_majors_by_income_range, min_income, max_income, limit, after)
+
+    async def get_majors_page(self, limit: int = 50, after: Optional[Tuple[int, int]] = None,
+                              min_income: Optional[int] = None,
+                              max_income: Optional[int] = None) -> Optional[Dict]:
+        return await self._run(self.storage.get_majors_page, limit, after, min_income, max_income)
+
+    async def get_major_by_name(self, major_name: str) -> Optional[Dict]:
+        return await self._run(self.storage.get_major_by_name, major_name)
+
+    async def get_statistics(self) -> Optional[Dict]:
+        return await self._run(self.storage.get_statistics)
+
+    async def delete_all_majors(self) -> bool:
+        return await self._run(self.storage.delete_all_majors)
+
+    async def _stream(self, make_iter: Callable) -> AsyncIterator[List]:
+        """
+        Drive a blocking batch iterator on one worker thread (streaming
+        cursors are tied to their connection and thread) and hand batches
+        to the event loop through a small bounded buffer.
+        """
+        loop = asyncio.get_running_loop()
+        batches: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(STREAM_QUEUE_SIZE)
+        stop = threading.Event()
+        done = object()
+
+        def produce():
+            try:
+                iterator = make_iter()
+                try:
+                    for batch in iterator:
+                        slots.acquire()
+                        if stop.is_set():
+                            break
+                        loop.call_soon_threadsafe(batches.put_nowait, batch)
+                finally:
+                    iterator.close()
+            finally:
+                loop.call_soon_threadsafe(batches.put_nowait, done)
+
+        producer = loop.run_in_executor(self._executor, produce)
+        try:
+            while True:
+                batch = await batches.get()
+                if batch is done:
+                    break
+                slots.release()
+                yield batch
+        finally:
+            # Wake a producer blocked on a full buffer so it sees `stop`
+            stop.set()
+            slots.release()
+            await producer
+
+    def iter_all_majors(self, batch_size: Optional[int] = None,
+                        as_tuples: bool = False) -> AsyncIterator[List]:
+        """Async-iterate all majors in batches, highest income first."""
+        return self._stream(lambda: self.storage.iter_all_majors(batch_size, as_tuples))
+
+    def iter_majors_by_income_range(self, min_income: int, max_income: int,
+                                    batch_size: Optional[int] = None,
+                                    as_tuples: bool = False) -> AsyncIterator[List]:
+        """Async-iterate majors within an income range in batches."""
+        return self._stream(lambda: self.storage.iter_majors_by_income_range(
+            min_income, max_income, batch_size, as_tuples))
@@ -0,0 +1,111 @@
+"""Storage interface shared by the MySQL and SQLite engines"""
+from abc import ABC, abstractmethod
+from datetime import date
+from typing import Iterator, List, Dict, Optional, Tuple
+
+
+class Storage(ABC):
+    """
+    Everything the scraper and API need from a storage engine. Engines
+    keep the same semantics: upserts keyed on major, income_stats kept in
+    step with every write, (income DESC, id) ordering with keyset cursors,
+    and per-run history. Query methods return None when the engine is
+    unavailable or a query fails; streaming iterators raise instead, so a
+    stream cut short is never mistaken for a complete one.
+    """
+
+    @abstractmethod
+    def connection(self):
+        """Context manager yielding a connection, or None if none can be opened."""
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release every open connection."""
+
+    @abstractmethod
+    def bulk_upsert_majors(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """Upsert majors in batches; returns rows, batches and failed_batches."""
+
+    def insert_majors(self, jobs: List[Dict], batch_size: Optional[int] = None) -> bool:
+        """Insert major/income data into database."""
+        result = self.bulk_upsert_majors(jobs, batch_size)
+        if result["failed_batches"]:
+            print(f"✗ Inserted {result['rows']} of {len(jobs)} majors, "
+                  f"{len(result['failed_batches'])} batches failed")
+            return False
+
+        print(f"✓ Successfully inserted {result['rows']} majors into database in {result['batches']} batches")
+        return True
+
+    @abstractmethod
+    def sync_majors(self, jobs: List[Dict], delete_missing: bool = False,
+                    batch_size: Optional[int] = None) -> Optional[Dict]:
+        """Write only new, changed (and optionally removed) majors; returns counts."""
+
+    @abstractmethod
+    def record_snapshot(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Optional[int]:
+        """Record a scrape run with its full snapshot; returns the run id."""
+
+    @abstractmethod
+    def get_scrape_runs(self, limit: int = 50) -> Optional[List[Dict]]:
+        """Most recent scrape runs, newest first."""
+
+    @abstractmethod
+    def get_major_history(self, major_name: str, since: Optional[date] = None,
+                          until: Optional[date] = None) -> Optional[List[Dict]]:
+        """One major's income per run, oldest first."""
+
+    @abstractmethod
+    def get_run_snapshot(self, run_id: int) -> Optional[List[Dict]]:
+        """Every major's income as recorded by one run."""
+
+    @abstractmethod
+    def get_all_majors(self) -> Optional[List[Dict]]:
+        """All majors sorted by income (highest first)."""
+
+    @abstractmethod
+    def iter_all_majors(self, batch_size: Optional[int] = None,
+                        as_tuples: bool = False) -> Iterator[List]:
+        """Stream all majors in batches of dicts or (id, major, income, timestamp) tuples."""
+
+    @abstractmethod
+    def iter_majors_by_income_range(self, min_income: int, max_income: int,
+                                    batch_size: Optional[int] = None,
+                                    as_tuples: bool = False) -> Iterator[List]:
+        """Stream majors within an income range in batches."""
+
+    @staticmethod
+    def next_cursor(page: List[Dict], limit: int) -> Optional[Tuple[int, int]]:
+        """Cursor for the page after `page`, or None if it was the last one."""
+        if not page or len(page) < limit:
+            return None
+        return page[-1]['income'], page[-1]['id']
+
+    @abstractmethod
+    def get_top_n_majors(self, n: int = 10,
+                         after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        """Top N majors by income, optionally after an (income, id) cursor."""
+
+    @abstractmethod
+    def get_majors_by_income_range(self, min_income: int, max_income: int,
+                                   limit: Optional[int] = None,
+                                   after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        """Majors within an income range, one keyset page at a time if `limit` is set."""
+
+    @abstractmethod
+    def get_majors_page(self, limit: int = 50, after: Optional[Tuple[int, int]] = None,
+                        min_income: Optional[int] = None,
+                        max_income: Optional[int] = None) -> Optional[Dict]:
+        """One page of majors: {"majors": [...], "next_cursor": (income, id) or None}."""
+
+    @abstractmethod
+    def get_major_by_name(self, major_name: str) -> Optional[Dict]:
+        """A specific major by name."""
+
+    @abstractmethod
+    def get_statistics(self) -> Optional[Dict]:
+        """Count, average, min, max income and data_version from income_stats."""
+
+    @abstractmethod
+    def delete_all_majors(self) -> bool:
+        """Clear all majors (for testing/reset)."""
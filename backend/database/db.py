@@ -1,220 +1,594 @@
 import pymysql
 import os
-from typing import List, Dict, Optional
-from datetime import datetime
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional, Tuple
+from datetime import date, datetime
 from dotenv import load_dotenv
+from .base import Storage
+from .pool import ConnectionPool
+from ..config import config
 
 # Load environment variables from .env
 load_dotenv()
 
-class Database:
+# Multi-row upsert; executemany folds the VALUES rows into one statement.
+# Uses the row alias form (MySQL 8.0.19+) since VALUES() in the UPDATE
+# clause is deprecated; PyMySQL 1.1+ still folds it into one statement.
+UPSERT_QUERY = """
+    INSERT INTO income_by_major (major, income, timestamp)
+    VALUES (%s, %s, %s) AS new
+    ON DUPLICATE KEY UPDATE income=new.income, timestamp=new.timestamp
+"""
+
+# Apply a write's count/sum deltas to the income_stats row; MIN/MAX come
+# straight off idx_income_id, so the whole update is a few index lookups
+STATS_UPDATE_QUERY = """
+    UPDATE income_stats SET
+        total_majors = total_majors + %s,
+        income_sum = income_sum + %s,
+        min_income = (SELECT MIN(income) FROM income_by_major),
+        max_income = (SELECT MAX(income) FROM income_by_major),
+        data_version = data_version + 1,
+        updated_at = %s
+    WHERE id = 1
+"""
+
+class Database(Storage):
+    """MySQL storage engine backed by a PyMySQL connection pool."""
+    
     def __init__(self, host: str = "localhost", user: str = "root", 
-                 password: Optional[str] = None, database: str = "income_major_db"):
+                 password: Optional[str] = None, database: str = "income_major_db",
+                 pool_min_size: Optional[int] = None, pool_max_size: Optional[int] = None):
+        """Initialize database connection parameters."""
         # If password not provided, load from .env
         if password is None:
             password = os.getenv("MY_SQL_PASSWORD", "root")
-        """Initialize database connection parameters."""
         self.host = host
         self.user = user
         self.password = password
         self.database = database
+        self.pool_min_size = config.DB_POOL_MIN_SIZE if pool_min_size is None else pool_min_size
+        self.pool_max_size = config.DB_POOL_MAX_SIZE if pool_max_size is None else pool_max_size
+        self._pool: Optional[ConnectionPool] = None
+        self._pool_lock = threading.Lock()
+    
+    def _open_connection(self):
+        """Open a new MySQL connection (TCP + auth handshake)."""
+        return pymysql.connect(
+            host=self.host,
+            user=self.user,
+            password=self.password,
+            database=self.database
+        )
+    
+    @property
+    def pool(self) -> ConnectionPool:
+        """Connection pool shared by all query methods, created on first use."""
+        with self._pool_lock:
+            if self._pool is None:
+                self._pool = ConnectionPool(
+                    self._open_connection,
+                    min_size=self.pool_min_size,
+                    max_size=self.pool_max_size,
+                    max_idle=config.DB_POOL_MAX_IDLE,
+                    timeout=config.DB_POOL_TIMEOUT,
+                )
+            return self._pool
     
     def connect(self):
-        """Establish connection to MySQL database."""
+        """Establish a standalone connection to MySQL database (not pooled)."""
         try:
-            conn = pymysql.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database
-            )
-            return conn
+            return self._open_connection()
         except pymysql.Error as e:
             print(f"Database connection error: {e}")
             return None
     
-    def insert_majors(self, jobs: List[Dict]) -> bool:
-        """Insert major/income data into database."""
-        conn = self.connect()
-        if not conn:
-            return False
-        
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection; yields None if none can be opened."""
         try:
-            cursor = conn.cursor()
-            
-            query = """
-                INSERT INTO income_by_major (major, income, timestamp)
-                VALUES (%s, %s, %s)
-                ON DUPLICATE KEY UPDATE income=%s, timestamp=%s
-            """
-            
-            for job in jobs:
-                cursor.execute(query, (
-                    job['major'],
-                    job['income'],
-                    datetime.now(),
-                    job['income'],
-                    datetime.now()
-                ))
-            
-            conn.commit()
-            print(f"✓ Successfully inserted {len(jobs)} majors into database")
-            return True
-        
+            conn = self.pool.acquire()
         except pymysql.Error as e:
-            print(f"✗ Insert error: {e}")
-            conn.rollback()
-            return False
+            print(f"Database connection error: {e}")
+            yield None
+            return
         
+        broken = False
+        try:
+            yield conn
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            broken = True
+            raise
         finally:
-            cursor.close()
-            conn.close()
+            self.pool.release(conn, discard=broken)
     
-    def get_all_majors(self) -> Optional[List[Dict]]:
-        """Retrieve all majors sorted by income (highest first)."""
-        conn = self.connect()
-        if not conn:
-            return None
+    def close(self) -> None:
+        """Close all pooled connections."""
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool = None
+    
+    def bulk_upsert_majors(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Upsert majors in multi-row INSERT ... ON DUPLICATE KEY UPDATE batches.
         
-        try:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            query = "SELECT id, major, income, timestamp FROM income_by_major ORDER BY income DESC"
-            cursor.execute(query)
-            results = cursor.fetchall()
-            print(f"✓ Retrieved {len(results)} majors from database")
-            return results
+        Every row in the run gets the same timestamp, and each batch of
+        `batch_size` rows is sent with executemany (which PyMySQL folds into
+        a single VALUES list) and committed as its own transaction together
+        with its income_stats update. A failed batch is rolled back and
+        reported without stopping the others. Returns counts plus a list of
+        failed batches.
+        """
+        if batch_size is None:
+            batch_size = config.DB_BATCH_SIZE
+        result = {"rows": 0, "batches": 0, "failed_batches": []}
+        # One row per major (last value wins), so duplicates are neither sent
+        # twice nor counted as extra rows
+        rows = list({job['major']: job['income'] for job in jobs}.items())
         
-        except pymysql.Error as e:
-            print(f"✗ Query error: {e}")
-            return None
+        with self.connection() as conn:
+            if not conn:
+                result["failed_batches"].append({"batch": None, "rows": len(rows),
+                                                 "error": "no database connection"})
+                return result
+            
+            run_timestamp = datetime.now()
+            
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                batch_number = start // batch_size + 1
+                try:
+                    incoming = dict(batch)
+                    with conn.cursor() as cursor:
+                        # Lock and read the rows being replaced to get the stats deltas
+                        placeholders = ", ".join(["%s"] * len(incoming))
+                        cursor.execute(f"SELECT major, income FROM income_by_major "
+                                       f"WHERE major IN ({placeholders}) FOR UPDATE", list(incoming))
+                        existing = cursor.fetchall()
+                        cursor.executemany(UPSERT_QUERY, [
+                            (major, income, run_timestamp) for major, income in incoming.items()
+                        ])
+                        cursor.execute(STATS_UPDATE_QUERY, (
+                            len(incoming) - len(existing),
+                            sum(incoming.values()) - sum(income for _, income in existing),
+                            run_timestamp,
+                        ))
+                    conn.commit()
+                    result["rows"] += len(batch)
+                    result["batches"] += 1
+                except pymysql.Error as e:
+                    print(f"✗ Insert error in batch {batch_number} ({len(batch)} rows): {e}")
+                    conn.rollback()
+                    result["failed_batches"].append({"batch": batch_number, "rows": len(batch),
+                                                     "error": str(e)})
         
-        finally:
-            cursor.close()
-            conn.close()
+        return result
     
-    def get_top_n_majors(self, n: int = 10) -> Optional[List[Dict]]:
-        """Retrieve top N majors by income."""
-        conn = self.connect()
-        if not conn:
-            return None
-        
-        try:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            query = f"SELECT id, major, income, timestamp FROM income_by_major ORDER BY income DESC LIMIT {n}"
-            cursor.execute(query)
-            results = cursor.fetchall()
-            print(f"✓ Retrieved top {n} majors from database")
-            return results
+    def sync_majors(self, jobs: List[Dict], delete_missing: bool = False,
+                    batch_size: Optional[int] = None) -> Optional[Dict]:
+        """
+        Write only what changed since the last run.
         
-        except pymysql.Error as e:
-            print(f"✗ Query error: {e}")
-            return None
+        Loads the current (major, income) state in one query, diffs it
+        against `jobs`, and in a single transaction upserts new and changed
+        majors and, with `delete_missing`, deletes majors no longer present,
+        adjusting income_stats to match. Unchanged rows (and their
+        timestamps) are left alone. Returns inserted/updated/deleted/unchanged
+        counts, or None on failure.
+        """
+        if batch_size is None:
+            batch_size = config.DB_BATCH_SIZE
         
-        finally:
-            cursor.close()
-            conn.close()
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT major, income FROM income_by_major FOR UPDATE")
+                    current = dict(cursor.fetchall())
+                    
+                    incoming = {job['major']: job['income'] for job in jobs}
+                    inserts = [(major, income) for major, income in incoming.items() if major not in current]
+                    updates = [(major, income) for major, income in incoming.items()
+                               if major in current and current[major] != income]
+                    deletes = [major for major in current if major not in incoming] if delete_missing else []
+                    
+                    run_timestamp = datetime.now()
+                    changed = inserts + updates
+                    for start in range(0, len(changed), batch_size):
+                        cursor.executemany(UPSERT_QUERY, [
+                            (major, income, run_timestamp) for major, income in changed[start:start + batch_size]
+                        ])
+                    for start in range(0, len(deletes), batch_size):
+                        batch = deletes[start:start + batch_size]
+                        placeholders = ", ".join(["%s"] * len(batch))
+                        cursor.execute(f"DELETE FROM income_by_major WHERE major IN ({placeholders})", batch)
+                    
+                    if changed or deletes:
+                        sum_delta = (sum(income for _, income in inserts)
+                                     + sum(income - current[major] for major, income in updates)
+                                     - sum(current[major] for major in deletes))
+                        cursor.execute(STATS_UPDATE_QUERY,
+                                       (len(inserts) - len(deletes), sum_delta, run_timestamp))
+                
+                conn.commit()
+                counts = {
+                    "inserted": len(inserts),
+                    "updated": len(updates),
+                    "deleted": len(deletes),
+                    "unchanged": len(incoming) - len(changed),
+                }
+                print(f"✓ Synced majors: {counts['inserted']} inserted, {counts['updated']} updated, "
+                      f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+                return counts
+            
+            except pymysql.Error as e:
+                print(f"✗ Sync error: {e}")
+                conn.rollback()
+                return None
     
-    def get_majors_by_income_range(self, min_income: int, max_income: int) -> Optional[List[Dict]]:
-        """Retrieve majors within income range."""
-        conn = self.connect()
-        if not conn:
-            return None
+    def record_snapshot(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Optional[int]:
+        """
+        Record a scrape run and append its full snapshot to income_history.
         
-        try:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            query = """
-                SELECT id, major, income, timestamp FROM income_by_major 
-                WHERE income BETWEEN %s AND %s 
-                ORDER BY income DESC
-            """
-            cursor.execute(query, (min_income, max_income))
-            results = cursor.fetchall()
-            print(f"✓ Retrieved {len(results)} majors in range ${min_income}-${max_income}")
-            return results
+        The run row and all history rows are written in one transaction,
+        so a run is either fully recorded or absent. Returns the run id,
+        or None on failure.
+        """
+        if batch_size is None:
+            batch_size = config.DB_BATCH_SIZE
         
-        except pymysql.Error as e:
-            print(f"✗ Query error: {e}")
-            return None
-        
-        finally:
-            cursor.close()
-            conn.close()
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                started_at = datetime.now()
+                run_date = started_at.date()
+                incoming = {job['major']: job['income'] for job in jobs}
+                with conn.cursor() as cursor:
+                    cursor.execute(
+                        "INSERT INTO scrape_runs (run_date, started_at) VALUES (%s, %s)",
+                        (run_date, started_at),
+                    )
+                    run_id = cursor.lastrowid
+                    rows = [(run_id, run_date, major, income) for major, income in incoming.items()]
+                    for start in range(0, len(rows), batch_size):
+                        cursor.executemany(
+                            "INSERT INTO income_history (run_id, run_date, major, income) "
+                            "VALUES (%s, %s, %s, %s)",
+                            rows[start:start + batch_size],
+                        )
+                    cursor.execute(
+                        "UPDATE scrape_runs SET finished_at = %s, total_majors = %s WHERE id = %s",
+                        (datetime.now(), len(rows), run_id),
+                    )
+                conn.commit()
+                print(f"✓ Recorded scrape run {run_id} with {len(rows)} majors")
+                return run_id
+            
+            except pymysql.Error as e:
+                print(f"✗ History error: {e}")
+                conn.rollback()
+                return None
     
-    def get_major_by_name(self, major_name: str) -> Optional[Dict]:
-        """Retrieve a specific major by name."""
-        conn = self.connect()
-        if not conn:
-            return None
-        
-        try:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            query = "SELECT id, major, income, timestamp FROM income_by_major WHERE major = %s"
-            cursor.execute(query, (major_name,))
-            result = cursor.fetchone()
+    def get_scrape_runs(self, limit: int = 50) -> Optional[List[Dict]]:
+        """Retrieve the most recent scrape runs, newest first."""
+        with self.connection() as conn:
+            if not conn:
+                return None
             
-            if result:
-                print(f"✓ Found major: {result['major']} (${result['income']})")
-            else:
-                print(f"✗ Major '{major_name}' not found")
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    query = """
+                        SELECT id, run_date, started_at, finished_at, total_majors
+                        FROM scrape_runs ORDER BY id DESC LIMIT %s
+                    """
+                    cursor.execute(query, (limit,))
+                    return cursor.fetchall()
             
-            return result
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def get_major_history(self, major_name: str, since: Optional[date] = None,
+                          until: Optional[date] = None) -> Optional[List[Dict]]:
+        """
+        Retrieve one major's income per run, oldest first.
         
-        except pymysql.Error as e:
-            print(f"✗ Query error: {e}")
-            return None
+        Reads a single primary-key range per partition; `since` / `until`
+        (inclusive run dates) prune partitions outside the window.
+        """
+        where = ["major = %s"]
+        params: List = [major_name]
+        if since is not None:
+            where.append("run_date >= %s")
+            params.append(since)
+        if until is not None:
+            where.append("run_date <= %s")
+            params.append(until)
         
-        finally:
-            cursor.close()
-            conn.close()
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    query = ("SELECT run_id, run_date, income FROM income_history WHERE "
+                             + " AND ".join(where) + " ORDER BY run_date, run_id")
+                    cursor.execute(query, params)
+                    results = cursor.fetchall()
+                print(f"✓ Retrieved {len(results)} history points for {major_name}")
+                return results
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
     
-    def get_statistics(self) -> Optional[Dict]:
-        """Retrieve income statistics from database."""
-        conn = self.connect()
-        if not conn:
-            return None
+    def get_run_snapshot(self, run_id: int) -> Optional[List[Dict]]:
+        """Retrieve every major's income as recorded by one scrape run."""
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    # Joining on the run's date lets MySQL prune to a single partition
+                    query = """
+                        SELECT h.major, h.income FROM scrape_runs r
+                        JOIN income_history h ON h.run_date = r.run_date AND h.run_id = r.id
+                        WHERE r.id = %s
+                        ORDER BY h.income DESC, h.major
+                    """
+                    cursor.execute(query, (run_id,))
+                    return cursor.fetchall()
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def get_all_majors(self) -> Optional[List[Dict]]:
+        """Retrieve all majors sorted by income (highest first)."""
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    query = "SELECT id, major, income, timestamp FROM income_by_major ORDER BY income DESC, id"
+                    cursor.execute(query)
+                    results = cursor.fetchall()
+                print(f"✓ Retrieved {len(results)} majors from database")
+                return results
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def _iter_query(self, query: str, params: tuple, batch_size: Optional[int],
+                    as_tuples: bool) -> Iterator[List]:
+        """
+        Stream a query's rows in batches through an unbuffered server-side
+        cursor, so only one batch is held in memory at a time. The pooled
+        connection stays checked out until the generator finishes; if it is
+        abandoned early the connection is discarded rather than drained.
+        Errors are raised rather than ending the stream, so a cut-short
+        result cannot pass for a complete one.
+        """
+        if batch_size is None:
+            batch_size = config.DB_STREAM_BATCH_SIZE
+        cursor_class = pymysql.cursors.SSCursor if as_tuples else pymysql.cursors.SSDictCursor
         
         try:
-            cursor = conn.cursor(pymysql.cursors.DictCursor)
-            query = """
-                SELECT 
-                    COUNT(*) as total_majors,
-                    AVG(income) as avg_income,
-                    MIN(income) as min_income,
-                    MAX(income) as max_income
-                FROM income_by_major
-            """
-            cursor.execute(query)
-            result = cursor.fetchone()
-            print(f"✓ Statistics retrieved: {result['total_majors']} majors")
-            return result
+            conn = self.pool.acquire()
+        except pymysql.Error as e:
+            print(f"Database connection error: {e}")
+            raise
         
+        finished = False
+        try:
+            cursor = conn.cursor(cursor_class)
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+            cursor.close()
+            finished = True
         except pymysql.Error as e:
             print(f"✗ Query error: {e}")
-            return None
-        
+            raise
         finally:
-            cursor.close()
-            conn.close()
+            self.pool.release(conn, discard=not finished)
     
-    def delete_all_majors(self) -> bool:
-        """Clear all data from the table (for testing/reset)."""
-        conn = self.connect()
-        if not conn:
-            return False
+    def iter_all_majors(self, batch_size: Optional[int] = None,
+                        as_tuples: bool = False) -> Iterator[List]:
+        """Stream all majors sorted by income (highest first) in batches.
         
-        try:
-            cursor = conn.cursor()
-            query = "DELETE FROM income_by_major"
-            cursor.execute(query)
-            conn.commit()
-            print(f"✓ Cleared all majors from database")
-            return True
+        Rows are dicts, or (id, major, income, timestamp) tuples with `as_tuples`.
+        """
+        query = "SELECT id, major, income, timestamp FROM income_by_major ORDER BY income DESC, id"
+        return self._iter_query(query, (), batch_size, as_tuples)
+    
+    def iter_majors_by_income_range(self, min_income: int, max_income: int,
+                                    batch_size: Optional[int] = None,
+                                    as_tuples: bool = False) -> Iterator[List]:
+        """Stream majors within an income range (highest first) in batches."""
+        query = """
+            SELECT id, major, income, timestamp FROM income_by_major 
+            WHERE income BETWEEN %s AND %s 
+            ORDER BY income DESC, id
+        """
+        return self._iter_query(query, (min_income, max_income), batch_size, as_tuples)
+    
+    def _fetch_page(self, where: List[str], params: List, limit: int,
+                    after: Optional[Tuple[int, int]]) -> Optional[List[Dict]]:
+        """
+        Run one keyset page ordered by (income DESC, id). `after` is the
+        (income, id) of the last row of the previous page; the seek uses
+        idx_income_id, so every page costs the same however deep it is.
+        """
+        where = list(where)
+        params = list(params)
+        if after is not None:
+            where.append("(income < %s OR (income = %s AND id > %s))")
+            params.extend([after[0], after[0], after[1]])
+        query = "SELECT id, major, income, timestamp FROM income_by_major"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY income DESC, id LIMIT %s"
+        params.append(limit)
         
-        except pymysql.Error as e:
-            print(f"✗ Delete error: {e}")
-            conn.rollback()
-            return False
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    cursor.execute(query, params)
+                    return cursor.fetchall()
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def get_top_n_majors(self, n: int = 10,
+                         after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        """Retrieve top N majors by income, optionally after an (income, id) cursor."""
+        results = self._fetch_page([], [], n, after)
+        if results is not None:
+            print(f"✓ Retrieved top {len(results)} majors from database")
+        return results
+    
+    def get_majors_by_income_range(self, min_income: int, max_income: int,
+                                   limit: Optional[int] = None,
+                                   after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        """Retrieve majors within income range, one keyset page at a time if `limit` is set."""
+        if limit is not None:
+            results = self._fetch_page(["income BETWEEN %s AND %s"], [min_income, max_income],
+                                       limit, after)
+            if results is not None:
+                print(f"✓ Retrieved {len(results)} majors in range ${min_income}-${max_income}")
+            return results
         
-        finally:
-            cursor.close()
-            conn.close()
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    query = """
+                        SELECT id, major, income, timestamp FROM income_by_major 
+                        WHERE income BETWEEN %s AND %s 
+                        ORDER BY income DESC, id
+                    """
+                    cursor.execute(query, (min_income, max_income))
+                    results = cursor.fetchall()
+                print(f"✓ Retrieved {len(results)} majors in range ${min_income}-${max_income}")
+                return results
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def get_majors_page(self, limit: int = 50, after: Optional[Tuple[int, int]] = None,
+                        min_income: Optional[int] = None,
+                        max_income: Optional[int] = None) -> Optional[Dict]:
+        """
+        One page of majors by income (highest first), optionally limited to
+        an income range. Returns {"majors": [...], "next_cursor": (income, id)
+        or None}.
+        """
+        where, params = [], []
+        if min_income is not None:
+            where.append("income >= %s")
+            params.append(min_income)
+        if max_income is not None:
+            where.append("income <= %s")
+            params.append(max_income)
+        page = self._fetch_page(where, params, limit, after)
+        if page is None:
+            return None
+        return {"majors": page, "next_cursor": self.next_cursor(page, limit)}
+    
+    def get_major_by_name(self, major_name: str) -> Optional[Dict]:
+        """Retrieve a specific major by name."""
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    query = "SELECT id, major, income, timestamp FROM income_by_major WHERE major = %s"
+                    cursor.execute(query, (major_name,))
+                    result = cursor.fetchone()
+                
+                if result:
+                    print(f"✓ Found major: {result['major']} (${result['income']})")
+                else:
+                    print(f"✗ Major '{major_name}' not found")
+                
+                return result
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def get_statistics(self) -> Optional[Dict]:
+        """Retrieve income statistics from the income_stats summary row."""
+        with self.connection() as conn:
+            if not conn:
+                return None
+            
+            try:
+                with conn.cursor(pymysql.cursors.DictCursor) as cursor:
+                    query = """
+                        SELECT 
+                            total_majors,
+                            income_sum / NULLIF(total_majors, 0) as avg_income,
+                            min_income,
+                            max_income,
+                            data_version
+                        FROM income_stats
+                        WHERE id = 1
+                    """
+                    cursor.execute(query)
+                    result = cursor.fetchone()
+                if result is None:
+                    print("✗ income_stats has no summary row, apply the migrations in 01-schema.sql")
+                    return None
+                print(f"✓ Statistics retrieved: {result['total_majors']} majors")
+                return result
+            
+            except pymysql.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+    
+    def delete_all_majors(self) -> bool:
+        """Clear all data from the table (for testing/reset)."""
+        with self.connection() as conn:
+            if not conn:
+                return False
+            
+            try:
+                with conn.cursor() as cursor:
+                    query = "DELETE FROM income_by_major"
+                    cursor.execute(query)
+                    cursor.execute("""
+                        UPDATE income_stats SET
+                            total_majors = 0, income_sum = 0, min_income = NULL, max_income = NULL,
+                            data_version = data_version + 1, updated_at = %s
+                        WHERE id = 1
+                    """, (datetime.now(),))
+                conn.commit()
+                print(f"✓ Cleared all majors from database")
+                return True
+            
+            except pymysql.Error as e:
+                print(f"✗ Delete error: {e}")
+                conn.rollback()
+                return False
@@ -0,0 +1,19 @@
+"""Storage engine selection"""
+from typing import Optional
+from .base import Storage
+from ..config import config
+
+ENGINES = ("mysql", "sqlite")
+
+
+def create_database(engine: Optional[str] = None) -> Storage:
+    """Create the storage engine named by `engine` (default: config.DB_ENGINE)."""
+    engine = (config.DB_ENGINE if engine is None else engine).lower()
+    if engine == "sqlite":
+        from .sqlite_db import SQLiteDatabase
+        return SQLiteDatabase(config.SQLITE_PATH)
+    if engine == "mysql":
+        from .db import Database
+        return Database(host=config.DB_HOST, user=config.DB_USER,
+                        password=config.DB_PASSWORD, database=config.DB_NAME)
+    raise ValueError(f"Unknown DB_ENGINE {engine!r}, expected one of {', '.join(ENGINES)}")
@@ -0,0 +1,177 @@
+"""Thread-safe connection pool for PyMySQL connections"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Tuple
+import pymysql
+
+
+class PoolTimeout(pymysql.err.OperationalError):
+    """Raised when no connection becomes available within the checkout timeout"""
+
+
+class ConnectionPool:
+    """
+    Keeps between `min_size` and `max_size` open connections made by
+    `connect`. Connections idle for longer than `max_idle` seconds are
+    evicted (down to `min_size`), and a connection that has been idle for
+    more than `ping_after` seconds is pinged on checkout and replaced if
+    the server has dropped it.
+    """
+
+    def __init__(self, connect: Callable[[], pymysql.connections.Connection],
+                 min_size: int = 1, max_size: int = 10, max_idle: float = 300.0,
+                 timeout: float = 10.0, ping_after: float = 5.0):
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.max_idle = max_idle
+        self.timeout = timeout
+        self.ping_after = ping_after
+
+        # Idle connections with the time they were returned, most recent last
+        self._idle: Deque[Tuple[pymysql.connections.Connection, float]] = deque()
+        self._size = 0
+        self._cond = threading.Condition()
+        self._closed = False
+        self.created = 0
+        self.checkouts = 0
+
+    def _evict_idle(self) -> list:
+        """Pop connections idle past max_idle, keeping min_size open (lock held)"""
+        evicted = []
+        now = time.monotonic()
+        # Oldest connections sit at the left of the deque
+        while self._idle and self._size > self.min_size and now - self._idle[0][1] > self.max_idle:
+            evicted.append(self._idle.popleft()[0])
+            self._size -= 1
+        return evicted
+
+    def _healthy(self, conn, idle_for: float) -> bool:
+        """Check a connection before handing it out"""
+        if not conn.open:
+            return False
+        if idle_for < self.ping_after:
+            return True
+        try:
+            conn.ping(reconnect=False)
+            return True
+        except pymysql.Error:
+            return False
+
+    def acquire(self, timeout: float | None = None):
+        """Check out a connection, opening a new one if below max_size"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        while True:
+            conn = None
+            with self._cond:
+                if self._closed:
+                    raise pymysql.err.InterfaceError("Connection pool is closed")
+                stale = self._evict_idle()
+                while conn is None:
+                    if self._idle:
+                        conn, returned_at = self._idle.pop()
+                        idle_for = time.monotonic() - returned_at
+                        break
+                    if self._size < self.max_size:
+                        # Reserve a slot; the handshake happens outside the lock
+                        self._size += 1
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolTimeout(f"No database connection available after waiting "
+                                          f"{self.timeout if timeout is None else timeout}s")
+                    self._cond.wait(remaining)
+            for old in stale:
+                _close_quietly(old)
+
+            if conn is None:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._cond:
+                        self._size -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self.created += 1
+            elif not self._healthy(conn, idle_for):
+                self._discard(conn)
+                continue
+
+            with self._cond:
+                self.checkouts += 1
+            return conn
+
+    def release(self, conn, discard: bool = False) -> None:
+        """Return a connection to the pool, or drop it if broken or `discard`"""
+        if discard or self._closed or not conn.open:
+            self._discard(conn)
+            return
+        try:
+            # End any open transaction so the next borrower gets a fresh snapshot
+            conn.rollback()
+        except pymysql.Error:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def _discard(self, conn) -> None:
+        _close_quietly(conn)
+        with self._cond:
+            self._size -= 1
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout: float | None = None):
+        """Context manager that checks a connection out and always returns it"""
+        conn = self.acquire(timeout)
+        broken = False
+        try:
+            yield conn
+        except (pymysql.err.OperationalError, pymysql.err.InterfaceError):
+            broken = True
+            raise
+        finally:
+            self.release(conn, discard=broken)
+
+    def fill(self) -> None:
+        """Open connections up to min_size ahead of the first request"""
+        conns = []
+        try:
+            while len(conns) < self.min_size:
+                conns.append(self.acquire())
+        finally:
+            for conn in conns:
+                self.release(conn)
+
+    def close(self) -> None:
+        """Close every idle connection; checked-out ones close when released"""
+        with self._cond:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._cond.notify_all()
+        for conn in idle:
+            _close_quietly(conn)
+
+    def stats(self) -> Dict:
+        with self._cond:
+            return {
+                "size": self._size,
+                "idle": len(self._idle),
+                "in_use": self._size - len(self._idle),
+                "created": self.created,
+                "checkouts": self.checkouts,
+            }
+
+
+def _close_quietly(conn) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
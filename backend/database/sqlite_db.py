@@ -0,0 +1,551 @@
+"""Embedded SQLite storage engine"""
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, List, Dict, Optional, Tuple
+from .base import Storage
+from ..config import config
+
+# Same tables and indexes as 01-schema.sql, in SQLite syntax. History has no
+# partitions here; its (major, run_date, run_id) key keeps series reads ordered.
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS income_by_major (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    major TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    income INTEGER NOT NULL,
+    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_income_id ON income_by_major (income DESC, id, major, timestamp);
+CREATE INDEX IF NOT EXISTS idx_timestamp ON income_by_major (timestamp);
+
+CREATE TABLE IF NOT EXISTS income_stats (
+    id INTEGER PRIMARY KEY,
+    total_majors INTEGER NOT NULL DEFAULT 0,
+    income_sum INTEGER NOT NULL DEFAULT 0,
+    min_income INTEGER,
+    max_income INTEGER,
+    data_version INTEGER NOT NULL DEFAULT 0,
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+);
+INSERT OR IGNORE INTO income_stats (id, total_majors, income_sum, min_income, max_income, data_version)
+SELECT 1, COUNT(*), COALESCE(SUM(income), 0), MIN(income), MAX(income), 1 FROM income_by_major;
+
+CREATE TABLE IF NOT EXISTS scrape_runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_date DATE NOT NULL,
+    started_at DATETIME NOT NULL,
+    finished_at DATETIME,
+    total_majors INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_run_date ON scrape_runs (run_date);
+
+CREATE TABLE IF NOT EXISTS income_history (
+    run_id INTEGER NOT NULL,
+    run_date DATE NOT NULL,
+    major TEXT NOT NULL,
+    income INTEGER NOT NULL,
+    PRIMARY KEY (major, run_date, run_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_run ON income_history (run_id);
+"""
+
+UPSERT_QUERY = """
+    INSERT INTO income_by_major (major, income, timestamp)
+    VALUES (?, ?, ?)
+    ON CONFLICT (major) DO UPDATE SET income = excluded.income, timestamp = excluded.timestamp
+"""
+
+STATS_UPDATE_QUERY = """
+    UPDATE income_stats SET
+        total_majors = total_majors + ?,
+        income_sum = income_sum + ?,
+        min_income = (SELECT MIN(income) FROM income_by_major),
+        max_income = (SELECT MAX(income) FROM income_by_major),
+        data_version = data_version + 1,
+        updated_at = ?
+    WHERE id = 1
+"""
+
+# Explicit adapters/converters so DATE and DATETIME columns round-trip as
+# date/datetime objects, like PyMySQL returns them
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" "))
+sqlite3.register_adapter(date, lambda value: value.isoformat())
+sqlite3.register_converter("DATETIME", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("DATE", lambda value: date.fromisoformat(value.decode()))
+
+
+def _dict_rows(cursor: sqlite3.Cursor, rows: List[tuple]) -> List[Dict]:
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in rows]
+
+
+class SQLiteDatabase(Storage):
+    """
+    SQLite storage engine in a single local file, for running without a
+    MySQL server. Uses WAL mode so API readers are not blocked by an
+    ingest, a small bounded pool of connections shared by all threads,
+    and BEGIN IMMEDIATE write transactions so concurrent writers queue on
+    the busy timeout instead of failing mid-transaction. A ":memory:"
+    database lives in a single connection, so its pool holds just one.
+    """
+
+    def __init__(self, path: Optional[str] = None, busy_timeout: Optional[float] = None,
+                 pool_size: Optional[int] = None):
+        """Initialize the database file location and apply the schema."""
+        self.path = str(config.SQLITE_PATH if path is None else path)
+        self.busy_timeout = config.SQLITE_BUSY_TIMEOUT if busy_timeout is None else busy_timeout
+        if self.path == ":memory:":
+            self.pool_size = 1
+        else:
+            self.pool_size = max(config.SQLITE_POOL_SIZE if pool_size is None else pool_size, 1)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._schema_ready = False
+
+        # Apply the schema once, up front; retried on first use if it fails here
+        with self.connection():
+            pass
+
+    def _open_connection(self) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with WAL, applying the schema if needed."""
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        # Connections move between threads through the pool, never used by two at once
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None,
+                               detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                conn.executescript(SCHEMA)
+                self._schema_ready = True
+        except sqlite3.Error:
+            conn.close()
+            raise
+        return conn
+
+    def _acquire(self) -> sqlite3.Connection:
+        """Check out an idle connection, opening one if below pool_size."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("Cannot use a closed database")
+            open_new = self._opened < self.pool_size
+            if open_new:
+                self._opened += 1
+        if open_new:
+            try:
+                return self._open_connection()
+            except BaseException:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        try:
+            return self._idle.get(timeout=self.busy_timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"No database connection available after waiting "
+                                           f"{self.busy_timeout}s") from None
+
+    def _release(self, conn: sqlite3.Connection) -> None:
+        """Return a connection to the pool, or close it if the engine is closed."""
+        with self._lock:
+            closed = self._closed
+            if closed:
+                self._opened -= 1
+        if closed:
+            conn.close()
+            return
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Check out a pooled connection; yields None if none can be obtained."""
+        try:
+            conn = self._acquire()
+        except sqlite3.Error as e:
+            print(f"Database connection error: {e}")
+            yield None
+            return
+        try:
+            yield conn
+        finally:
+            self._release(conn)
+
+    @contextmanager
+    def _transaction(self, conn: sqlite3.Connection):
+        """Run a block as one write transaction, rolling back on error."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn.cursor()
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def close(self) -> None:
+        """Close idle connections now and checked-out ones when they are returned."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            with self._lock:
+                self._opened -= 1
+            conn.close()
+
+    def bulk_upsert_majors(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Dict:
+        """
+        Upsert majors with INSERT ... ON CONFLICT DO UPDATE, one transaction
+        (including its income_stats update) per batch of `batch_size` rows.
+        A failed batch is rolled back and reported without stopping the
+        others. Returns counts plus a list of failed batches.
+        """
+        if batch_size is None:
+            batch_size = config.DB_BATCH_SIZE
+        result = {"rows": 0, "batches": 0, "failed_batches": []}
+        # One row per major (last value wins), so duplicates are neither sent
+        # twice nor counted as extra rows
+        rows = list({job['major']: job['income'] for job in jobs}.items())
+
+        with self.connection() as conn:
+            if not conn:
+                result["failed_batches"].append({"batch": None, "rows": len(rows),
+                                                 "error": "no database connection"})
+                return result
+
+            run_timestamp = datetime.now()
+
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                batch_number = start // batch_size + 1
+                try:
+                    incoming = dict(batch)
+                    with self._transaction(conn) as cursor:
+                        placeholders = ", ".join(["?"] * len(incoming))
+                        cursor.execute(f"SELECT major, income FROM income_by_major "
+                                       f"WHERE major IN ({placeholders})", list(incoming))
+                        existing = cursor.fetchall()
+                        cursor.executemany(UPSERT_QUERY, [
+                            (major, income, run_timestamp) for major, income in incoming.items()
+                        ])
+                        cursor.execute(STATS_UPDATE_QUERY, (
+                            len(incoming) - len(existing),
+                            sum(incoming.values()) - sum(income for _, income in existing),
+                            run_timestamp,
+                        ))
+                    result["rows"] += len(batch)
+                    result["batches"] += 1
+                except sqlite3.Error as e:
+                    print(f"✗ Insert error in batch {batch_number} ({len(batch)} rows): {e}")
+                    result["failed_batches"].append({"batch": batch_number, "rows": len(batch),
+                                                     "error": str(e)})
+
+        return result
+
+    def sync_majors(self, jobs: List[Dict], delete_missing: bool = False,
+                    batch_size: Optional[int] = None) -> Optional[Dict]:
+        """
+        Write only what changed since the last run, in one transaction,
+        adjusting income_stats to match. Returns
+        inserted/updated/deleted/unchanged counts, or None on failure.
+        """
+        if batch_size is None:
+            batch_size = config.DB_BATCH_SIZE
+
+        with self.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                with self._transaction(conn) as cursor:
+                    cursor.execute("SELECT major, income FROM income_by_major")
+                    current = dict(cursor.fetchall())
+
+                    incoming = {job['major']: job['income'] for job in jobs}
+                    inserts = [(major, income) for major, income in incoming.items() if major not in current]
+                    updates = [(major, income) for major, income in incoming.items()
+                               if major in current and current[major] != income]
+                    deletes = [major for major in current if major not in incoming] if delete_missing else []
+
+                    run_timestamp = datetime.now()
+                    changed = inserts + updates
+                    for start in range(0, len(changed), batch_size):
+                        cursor.executemany(UPSERT_QUERY, [
+                            (major, income, run_timestamp) for major, income in changed[start:start + batch_size]
+                        ])
+                    for start in range(0, len(deletes), batch_size):
+                        batch = deletes[start:start + batch_size]
+                        placeholders = ", ".join(["?"] * len(batch))
+                        cursor.execute(f"DELETE FROM income_by_major WHERE major IN ({placeholders})", batch)
+
+                    if changed or deletes:
+                        sum_delta = (sum(income for _, income in inserts)
+                                     + sum(income - current[major] for major, income in updates)
+                                     - sum(current[major] for major in deletes))
+                        cursor.execute(STATS_UPDATE_QUERY,
+                                       (len(inserts) - len(deletes), sum_delta, run_timestamp))
+
+                counts = {
+                    "inserted": len(inserts),
+                    "updated": len(updates),
+                    "deleted": len(deletes),
+                    "unchanged": len(incoming) - len(changed),
+                }
+                print(f"✓ Synced majors: {counts['inserted']} inserted, {counts['updated']} updated, "
+                      f"{counts['deleted']} deleted, {counts['unchanged']} unchanged")
+                return counts
+
+            except sqlite3.Error as e:
+                print(f"✗ Sync error: {e}")
+                return None
+
+    def record_snapshot(self, jobs: List[Dict], batch_size: Optional[int] = None) -> Optional[int]:
+        """Record a scrape run and its full snapshot in one transaction; returns the run id."""
+        if batch_size is None:
+            batch_size = config.DB_BATCH_SIZE
+
+        with self.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                started_at = datetime.now()
+                run_date = started_at.date()
+                incoming = {job['major']: job['income'] for job in jobs}
+                with self._transaction(conn) as cursor:
+                    cursor.execute("INSERT INTO scrape_runs (run_date, started_at) VALUES (?, ?)",
+                                   (run_date, started_at))
+                    run_id = cursor.lastrowid
+                    rows = [(run_id, run_date, major, income) for major, income in incoming.items()]
+                    for start in range(0, len(rows), batch_size):
+                        cursor.executemany(
+                            "INSERT INTO income_history (run_id, run_date, major, income) VALUES (?, ?, ?, ?)",
+                            rows[start:start + batch_size],
+                        )
+                    cursor.execute("UPDATE scrape_runs SET finished_at = ?, total_majors = ? WHERE id = ?",
+                                   (datetime.now(), len(rows), run_id))
+                print(f"✓ Recorded scrape run {run_id} with {len(rows)} majors")
+                return run_id
+
+            except sqlite3.Error as e:
+                print(f"✗ History error: {e}")
+                return None
+
+    def _query(self, query: str, params: tuple = ()) -> Optional[List[Dict]]:
+        """Run a read query and return its rows as dicts, or None on error."""
+        with self.connection() as conn:
+            if not conn:
+                return None
+
+            try:
+                cursor = conn.execute(query, params)
+                return _dict_rows(cursor, cursor.fetchall())
+
+            except sqlite3.Error as e:
+                print(f"✗ Query error: {e}")
+                return None
+
+    def get_scrape_runs(self, limit: int = 50) -> Optional[List[Dict]]:
+        """Retrieve the most recent scrape runs, newest first."""
+        return self._query("""
+            SELECT id, run_date, started_at, finished_at, total_majors
+            FROM scrape_runs ORDER BY id DESC LIMIT ?
+        """, (limit,))
+
+    def get_major_history(self, major_name: str, since: Optional[date] = None,
+                          until: Optional[date] = None) -> Optional[List[Dict]]:
+        """Retrieve one major's income per run, oldest first."""
+        where = ["major = ?"]
+        params: List = [major_name]
+        if since is not None:
+            where.append("run_date >= ?")
+            params.append(since)
+        if until is not None:
+            where.append("run_date <= ?")
+            params.append(until)
+        results = self._query("SELECT run_id, run_date, income FROM income_history WHERE "
+                              + " AND ".join(where) + " ORDER BY run_date, run_id", tuple(params))
+        if results is not None:
+            print(f"✓ Retrieved {len(results)} history points for {major_name}")
+        return results
+
+    def get_run_snapshot(self, run_id: int) -> Optional[List[Dict]]:
+        """Retrieve every major's income as recorded by one scrape run."""
+        return self._query(
+            "SELECT major, income FROM income_history WHERE run_id = ? ORDER BY income DESC, major",
+            (run_id,),
+        )
+
+    def get_all_majors(self) -> Optional[List[Dict]]:
+        """Retrieve all majors sorted by income (highest first)."""
+        results = self._query("SELECT id, major, income, timestamp FROM income_by_major ORDER BY income DESC, id")
+        if results is not None:
+            print(f"✓ Retrieved {len(results)} majors from database")
+        return results
+
+    def _iter_query(self, query: str, params: tuple, batch_size: Optional[int],
+                    as_tuples: bool) -> Iterator[List]:
+        """
+        Stream a query's rows in batches; SQLite steps the statement lazily.
+        Errors are raised rather than ending the stream early.
+        """
+        if batch_size is None:
+            batch_size = config.DB_STREAM_BATCH_SIZE
+
+        try:
+            conn = self._acquire()
+        except sqlite3.Error as e:
+            print(f"Database connection error: {e}")
+            raise
+
+        # The connection stays checked out until the stream is exhausted or closed
+        cursor = conn.cursor()
+        try:
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows if as_tuples else _dict_rows(cursor, rows)
+        except sqlite3.Error as e:
+            print(f"✗ Query error: {e}")
+            raise
+        finally:
+            cursor.close()
+            self._release(conn)
+
+    def iter_all_majors(self, batch_size: Optional[int] = None,
+                        as_tuples: bool = False) -> Iterator[List]:
+        """Stream all majors sorted by income (highest first) in batches."""
+        query = "SELECT id, major, income, timestamp FROM income_by_major ORDER BY income DESC, id"
+        return self._iter_query(query, (), batch_size, as_tuples)
+
+    def iter_majors_by_income_range(self, min_income: int, max_income: int,
+                                    batch_size: Optional[int] = None,
+                                    as_tuples: bool = False) -> Iterator[List]:
+        """Stream majors within an income range (highest first) in batches."""
+        query = """
+            SELECT id, major, income, timestamp FROM income_by_major
+            WHERE income BETWEEN ? AND ?
+            ORDER BY income DESC, id
+        """
+        return self._iter_query(query, (min_income, max_income), batch_size, as_tuples)
+
+    def _fetch_page(self, where: List[str], params: List, limit: int,
+                    after: Optional[Tuple[int, int]]) -> Optional[List[Dict]]:
+        """Run one keyset page ordered by (income DESC, id) using idx_income_id."""
+        where = list(where)
+        params = list(params)
+        if after is not None:
+            where.append("(income < ? OR (income = ? AND id > ?))")
+            params.extend([after[0], after[0], after[1]])
+        query = "SELECT id, major, income, timestamp FROM income_by_major"
+        if where:
+            query += " WHERE " + " AND ".join(where)
+        query += " ORDER BY income DESC, id LIMIT ?"
+        params.append(limit)
+        return self._query(query, tuple(params))
+
+    def get_top_n_majors(self, n: int = 10,
+                         after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        """Retrieve top N majors by income, optionally after an (income, id) cursor."""
+        results = self._fetch_page([], [], n, after)
+        if results is not None:
+            print(f"✓ Retrieved top {len(results)} majors from database")
+        return results
+
+    def get_majors_by_income_range(self, min_income: int, max_income: int,
+                                   limit: Optional[int] = None,
+                                   after: Optional[Tuple[int, int]] = None) -> Optional[List[Dict]]:
+        """Retrieve majors within income range, one keyset page at a time if `limit` is set."""
+        if limit is None:
+            results = self._query("""
+                SELECT id, major, income, timestamp FROM income_by_major
+                WHERE income BETWEEN ? AND ?
+                ORDER BY income DESC, id
+            """, (min_income, max_income))
+        else:
+            results = self._fetch_page(["income BETWEEN ? AND ?"], [min_income, max_income],
+                                       limit, after)
+        if results is not None:
+            print(f"✓ Retrieved {len(results)} majors in range ${min_income}-${max_income}")
+        return results
+
+    def get_majors_page(self, limit: int = 50, after: Optional[Tuple[int, int]] = None,
+                        min_income: Optional[int] = None,
+                        max_income: Optional[int] = None) -> Optional[Dict]:
+        """One page of majors by income, optionally limited to an income range."""
+        where, params = [], []
+        if min_income is not None:
+            where.append("income >= ?")
+            params.append(min_income)
+        if max_income is not None:
+            where.append("income <= ?")
+            params.append(max_income)
+        page = self._fetch_page(where, params, limit, after)
+        if page is None:
+            return None
+        return {"majors": page, "next_cursor": self.next_cursor(page, limit)}
+
+    def get_major_by_name(self, major_name: str) -> Optional[Dict]:
+        """Retrieve a specific major by name."""
+        results = self._query("SELECT id, major, income, timestamp FROM income_by_major WHERE major = ?",
+                              (major_name,))
+        if results is None:
+            return None
+        if results:
+            print(f"✓ Found major: {results[0]['major']} (${results[0]['income']})")
+            return results[0]
+        print(f"✗ Major '{major_name}' not found")
+        return None
+
+    def get_statistics(self) -> Optional[Dict]:
+        """Retrieve income statistics from the income_stats summary row."""
+        results = self._query("""
+            SELECT
+                total_majors,
+                CAST(income_sum AS REAL) / NULLIF(total_majors, 0) as avg_income,
+                min_income,
+                max_income,
+                data_version
+            FROM income_stats
+            WHERE id = 1
+        """)
+        if not results:
+            return None
+        print(f"✓ Statistics retrieved: {results[0]['total_majors']} majors")
+        return results[0]
+
+    def delete_all_majors(self) -> bool:
+        """Clear all data from the table (for testing/reset)."""
+        with self.connection() as conn:
+            if not conn:
+                return False
+
+            try:
+                with self._transaction(conn) as cursor:
+                    cursor.execute("DELETE FROM income_by_major")
+                    cursor.execute("""
+                        UPDATE income_stats SET
+                            total_majors = 0, income_sum = 0, min_income = NULL, max_income = NULL,
+                            data_version = data_version + 1, updated_at = ?
+                        WHERE id = 1
+                    """, (datetime.now(),))
+                print(f"✓ Cleared all majors from database")
+                return True
+
+            except sqlite3.Error as e:
+                print(f"✗ Delete error: {e}")
+                return False
@@ -6,8 +6,8 @@ from pathlib import Path
 # Add parent directory to path for relative imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from backend.scraper import fetch_from_multiple_sources
-from backend.database import Database
+from backend.scraper import fetch_from_multiple_sources, SourceScheduler
+from backend.database import create_database
 from backend.config import config
 
 
@@ -21,7 +21,12 @@ def main():
     # Step 1: Fetch and parse data from multiple sources
     print("\n[1/3] Fetching and parsing data from multiple sources...")
     try:
-        unique_jobs = fetch_from_multiple_sources()
+        scheduler = SourceScheduler()
+        unique_jobs = fetch_from_multiple_sources(scheduler=scheduler)
+        sched_stats = scheduler.stats()
+        print(f"✓ Scheduler: {sched_stats['completed']} sources completed, "
+              f"{sched_stats['queue_depth']} still queued, "
+              f"avg wait {sched_stats['avg_wait']:.2f}s, max wait {sched_stats['max_wait']:.2f}s")
         if not unique_jobs:
             print("✗ No data returned from sources")
             return False
@@ -44,14 +49,23 @@ def main():
     # Step 3: Insert into database
     print("\n[3/3] Inserting data into database...")
     try:
-        db = Database(
-            host=config.DB_HOST,
-            user=config.DB_USER,
-            password=config.DB_PASSWORD,
-            database=config.DB_NAME
-        )
-        db.insert_majors(unique_jobs)
-        print(f"✓ Inserted {len(unique_jobs)} majors into database")
+        db = create_database()
+        if config.DB_WRITE_MODE == "sync":
+            counts = db.sync_majors(unique_jobs, delete_missing=config.DB_SYNC_DELETE_MISSING)
+            if counts is None:
+                print("✗ Failed to sync majors into database")
+                return False
+            print(f"✓ Synced {len(unique_jobs)} majors into database "
+                  f"({counts['inserted'] + counts['updated'] + counts['deleted']} rows written)")
+        else:
+            if not db.insert_majors(unique_jobs):
+                print("✗ Failed to insert majors into database")
+                return False
+            print(f"✓ Inserted {len(unique_jobs)} majors into database")
+        
+        if config.DB_RECORD_HISTORY and db.record_snapshot(unique_jobs) is None:
+            # The latest values are already written; a missing snapshot is not fatal
+            print("⚠ Failed to record this run in income history")
         
         # Display statistics
         stats = db.get_statistics()
@@ -1,16 +1,48 @@
 """Scraper package for fetching and parsing college major data"""
-from .fetcher import fetch_from_multiple_sources, fetch_page_html
-from .parser import parse_job_data_csv, average_duplicate_majors, save_to_json, parse_income_value
-from .sources import BASE_URL, ALTERNATE_SOURCES, ALL_SOURCES
+from .fetcher import fetch_from_multiple_sources, fetch_page_html, get_session
+from .parser import (
+    parse_job_data_csv,
+    iter_job_data_csv,
+    average_duplicate_majors,
+    save_to_json,
+    parse_income_value,
+)
+from .sources import BASE_URL, ALTERNATE_SOURCES, ALL_SOURCES, MIRRORS
+from .columnar import parse_income_column, iter_income_batches
+from .aggregator import MajorAggregator
+from .sharded import parse_file_parallel
+from .cache import ResponseCache
+from .replay import ReplayServer, record_sources
+from .policy import FetchPolicy, CircuitBreaker, get_policy
+from .scheduler import SourceScheduler
+from .schemas import SourceSchema, SOURCE_SCHEMAS, DEFAULT_SCHEMA, get_schema
 
 __all__ = [
     'fetch_from_multiple_sources',
     'fetch_page_html',
+    'get_session',
     'parse_job_data_csv',
+    'iter_job_data_csv',
     'average_duplicate_majors',
+    'MajorAggregator',
+    'parse_file_parallel',
     'save_to_json',
     'parse_income_value',
+    'parse_income_column',
+    'iter_income_batches',
     'BASE_URL',
     'ALTERNATE_SOURCES',
-    'ALL_SOURCES'
+    'ALL_SOURCES',
+    'MIRRORS',
+    'ResponseCache',
+    'ReplayServer',
+    'record_sources',
+    'FetchPolicy',
+    'CircuitBreaker',
+    'get_policy',
+    'SourceScheduler',
+    'SourceSchema',
+    'SOURCE_SCHEMAS',
+    'DEFAULT_SCHEMA',
+    'get_schema'
 ]
@@ -0,0 +1,87 @@
+"""Incremental, mergeable per-major income aggregation"""
+from typing import Dict, Iterable, List
+from ..utils import normalize_major
+
+# Positions inside each per-major stats list
+COUNT, TOTAL, MIN, MAX = range(4)
+
+
+class MajorAggregator:
+    """
+    Keeps only a running count/sum/min/max per normalized major, so memory
+    grows with the number of unique majors rather than the number of rows.
+    Partial aggregators built from different sources, threads or processes
+    can be combined with `merge`, and `finalize` produces the averaged
+    {'major', 'income', 'count'} records.
+    """
+
+    def __init__(self):
+        self._stats: Dict[str, List[int]] = {}
+        self.records = 0
+
+    def add(self, major: str, income: int) -> None:
+        """Fold a single major/income observation into the running stats"""
+        major = normalize_major(major)
+        stats = self._stats.get(major)
+        if stats is None:
+            self._stats[major] = [1, income, income, income]
+        else:
+            stats[COUNT] += 1
+            stats[TOTAL] += income
+            if income < stats[MIN]:
+                stats[MIN] = income
+            if income > stats[MAX]:
+                stats[MAX] = income
+        self.records += 1
+
+    def add_jobs(self, jobs: Iterable[Dict]) -> "MajorAggregator":
+        """Fold an iterable of {'major', 'income'} rows, e.g. a row generator"""
+        for job in jobs:
+            self.add(job['major'], job['income'])
+        return self
+
+    def add_batch(self, majors: List[str], incomes: Iterable[int]) -> "MajorAggregator":
+        """Fold a column batch such as those from iter_income_batches"""
+        for major, income in zip(majors, incomes):
+            self.add(major, int(income))
+        return self
+
+    def merge(self, other: "MajorAggregator") -> "MajorAggregator":
+        """Combine another partial aggregator into this one"""
+        for major, theirs in other._stats.items():
+            ours = self._stats.get(major)
+            if ours is None:
+                self._stats[major] = list(theirs)
+            else:
+                ours[COUNT] += theirs[COUNT]
+                ours[TOTAL] += theirs[TOTAL]
+                ours[MIN] = min(ours[MIN], theirs[MIN])
+                ours[MAX] = max(ours[MAX], theirs[MAX])
+        self.records += other.records
+        return self
+
+    def __len__(self) -> int:
+        return len(self._stats)
+
+    def to_dict(self) -> Dict:
+        """Serializable snapshot of the running stats"""
+        return {"records": self.records, "majors": self._stats}
+
+    @classmethod
+    def from_dict(cls, state: Dict) -> "MajorAggregator":
+        """Rebuild an aggregator from a to_dict snapshot"""
+        aggregator = cls()
+        aggregator._stats = {major: list(stats) for major, stats in state["majors"].items()}
+        aggregator.records = state["records"]
+        return aggregator
+
+    def finalize(self) -> List[Dict]:
+        """Return one record per major with its averaged income"""
+        return [
+            {
+                'major': major,
+                'income': int(round(stats[TOTAL] / stats[COUNT])),
+                'count': stats[COUNT]  # Track how many sources were averaged
+            }
+            for major, stats in self._stats.items()
+        ]
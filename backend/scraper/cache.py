@@ -0,0 +1,128 @@
+"""Persistent on-disk cache for source responses and their parsed summaries"""
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+from ..config import config
+
+
+class ResponseCache:
+    """
+    Stores the body, validators (ETag / Last-Modified), a content hash and
+    the parsed per-major summary for each source URL, so later runs can
+    send conditional GETs and skip parsing when a source has not changed.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = Path(cache_dir or config.SCRAPER_CACHE_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, url: str, suffix: str) -> Path:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return self.cache_dir / f"{key}{suffix}"
+
+    @staticmethod
+    def _write_atomic(path: Path, data: bytes) -> None:
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def get(self, url: str) -> Optional[Dict]:
+        """Return cached metadata for a URL, or None if it was never stored"""
+        try:
+            with open(self._path(url, ".json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def conditional_headers(self, entry: Optional[Dict]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from cached metadata"""
+        headers = {}
+        if entry and self.body_path(entry["url"]).exists():
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def body_path(self, url: str) -> Path:
+        """Location of the cached raw body for a URL"""
+        return self._path(url, ".body")
+
+    def load_body(self, url: str) -> Optional[bytes]:
+        """Return the cached raw body for a URL"""
+        try:
+            with open(self.body_path(url), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def load_summary(self, url: str, parser_version: int) -> Optional[Dict]:
+        """Return the summary parsed from the cached body, if produced by the same parser version"""
+        entry = self.get(url)
+        if not entry or entry.get("parser_version") != parser_version:
+            return None
+        try:
+            with open(self._path(url, ".summary.json"), "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store_body(self, url: str, chunks: Iterable[bytes]) -> Tuple[Path, str]:
+        """
+        Stream a response body to a staging file next to the cache entry.
+
+        Returns the staging path and the body's content hash; the entry is
+        only updated once `store` commits the staged body.
+        """
+        staging_path = self._path(url, f".body.{os.getpid()}.{threading.get_ident()}.part")
+        digest = hashlib.sha256()
+        with open(staging_path, "wb") as f:
+            for chunk in chunks:
+                digest.update(chunk)
+                f.write(chunk)
+        return staging_path, digest.hexdigest()
+
+    def discard_body(self, staging_path: Path) -> None:
+        """Remove a staged body that turned out not to be needed"""
+        try:
+            os.remove(staging_path)
+        except OSError:
+            pass
+
+    def store(self, url: str, staging_path: Path, sha256: str, etag: Optional[str],
+              last_modified: Optional[str], summary: Optional[Dict] = None,
+              parser_version: Optional[int] = None) -> None:
+        """Commit a staged body together with the summary parsed from it, if any"""
+        os.replace(staging_path, self.body_path(url))
+        summary_path = self._path(url, ".summary.json")
+        if summary is None:
+            # A summary parsed from an older body no longer applies
+            self.discard_body(summary_path)
+        else:
+            self._write_atomic(summary_path, json.dumps(summary).encode("utf-8"))
+        self._write_metadata(url, {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": sha256,
+            "parser_version": parser_version,
+            "fetched_at": time.time(),
+        })
+
+    def touch(self, url: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """Record a revalidation, keeping any newer validators the server sent"""
+        entry = self.get(url)
+        if not entry:
+            return
+        entry["etag"] = etag or entry.get("etag")
+        entry["last_modified"] = last_modified or entry.get("last_modified")
+        entry["fetched_at"] = time.time()
+        self._write_metadata(url, entry)
+
+    def _write_metadata(self, url: str, entry: Dict) -> None:
+        self._write_atomic(self._path(url, ".json"), json.dumps(entry, indent=2).encode("utf-8"))
@@ -0,0 +1,109 @@
+"""Columnar (NumPy) ingestion of college major income data"""
+import csv
+import io
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+import numpy as np
+from .parser import parse_income_value, _decoded_lines
+from .schemas import SourceSchema, DEFAULT_SCHEMA
+
+# Longest digit string that always fits in an int64
+MAX_FAST_DIGITS = 18
+
+# Longest value placed in the column array. NumPy sizes every element to
+# the longest string, so longer (garbage) values go to the scalar parser
+# instead of widening the whole batch.
+MAX_ARRAY_WIDTH = 64
+INT64_MAX = np.iinfo(np.int64).max
+
+
+def parse_income_column(raw_values: Sequence[str | None]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse a whole column of raw salary strings at once.
+
+    Returns an int64 array of incomes and a boolean validity mask; entries
+    where the mask is False hold 0. Plain digit strings (the common case)
+    are converted in one vectorized pass, and only the remainder such as
+    "75k", "$75,000 to 99,999" or values longer than MAX_ARRAY_WIDTH goes
+    through parse_income_value.
+    """
+    count = len(raw_values)
+    incomes = np.zeros(count, dtype=np.int64)
+    valid = np.zeros(count, dtype=bool)
+    if count == 0:
+        return incomes, valid
+
+    stripped = [v.strip() if v is not None else "" for v in raw_values]
+    oversized = [i for i, v in enumerate(stripped) if len(v) > MAX_ARRAY_WIDTH]
+    if oversized:
+        stripped_oversized = [stripped[i] for i in oversized]
+        for i in oversized:
+            stripped[i] = ""
+    values = np.array(stripped, dtype=str)
+
+    # Fast path: pure digits short enough for int64
+    fast = np.char.isdecimal(values) & (np.char.str_len(values) <= MAX_FAST_DIGITS)
+    if fast.any():
+        try:
+            incomes[fast] = values[fast].astype(np.int64)
+            valid[fast] = True
+        except ValueError:
+            # Non-ASCII decimal digits; let the scalar parser handle them
+            fast[:] = False
+
+    # Slow path: anything else that is not empty, including oversized values
+    slow = [(i, values[i]) for i in np.flatnonzero(~fast & (values != ""))]
+    if oversized:
+        slow.extend(zip(oversized, stripped_oversized))
+    for i, raw in slow:
+        income_value = parse_income_value(raw)
+        if income_value is not None and income_value <= INT64_MAX:
+            incomes[i] = income_value
+            valid[i] = True
+
+    return incomes, valid
+
+
+def iter_income_batches(source: Union[str, Iterable], schema: Optional[SourceSchema] = None,
+                        batch_size: int = 65536) -> Iterator[Tuple[List[str], np.ndarray]]:
+    """
+    Stream CSV data as column batches of (majors, incomes).
+
+    Accepts the same inputs as iter_job_data_csv. Each batch holds up to
+    `batch_size` rows whose major is non-empty and whose income parsed.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    if schema is None:
+        schema = DEFAULT_SCHEMA
+
+    reader = csv.reader(_decoded_lines(source))
+    header = next(reader, None)
+    extract = schema.compile(header) if header else None
+    if extract is None:
+        print(f"⚠ CSV header does not match {schema}, skipping source")
+        return
+
+    majors: List[str] = []
+    raw_incomes: List[str] = []
+    for cols in reader:
+        try:
+            major, median_salary_str = extract(cols)
+        except IndexError:
+            continue
+        majors.append(major)
+        raw_incomes.append(median_salary_str)
+
+        if len(majors) >= batch_size:
+            yield _finish_batch(majors, raw_incomes)
+            majors, raw_incomes = [], []
+
+    if majors:
+        yield _finish_batch(majors, raw_incomes)
+
+
+def _finish_batch(majors: List[str], raw_incomes: List[str]) -> Tuple[List[str], np.ndarray]:
+    """Parse a batch's income column and drop rows without a major or income"""
+    incomes, valid = parse_income_column(raw_incomes)
+    stripped = [major.strip() for major in majors]
+    keep = valid & np.fromiter((bool(major) for major in stripped), dtype=bool, count=len(stripped))
+    return [major for major, k in zip(stripped, keep) if k], incomes[keep]
@@ -1,48 +1,252 @@
 """Fetcher for college major income data from multiple sources"""
+import csv
+import io
+import itertools
+import threading
+import time
 import requests
-from typing import Dict, List
-from .sources import ALL_SOURCES, HEADERS
-from .parser import parse_job_data_csv, average_duplicate_majors
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional
+from .sources import ALL_SOURCES, HEADERS, MIRRORS
+from .parser import iter_job_data_csv, PARSER_VERSION
+from .aggregator import MajorAggregator
+from .sharded import parse_file_parallel
+from .replay import get_replay_base_url, replay_url
+from .policy import get_policy
+from .scheduler import SourceScheduler
+from .cache import ResponseCache
+from .schemas import SourceSchema, get_schema
+from ..config import config
 
 
-def fetch_page_html(url: str) -> str | None:
-    """Fetch CSV content from a single URL"""
+# Bytes read per chunk when streaming a response body to the cache
+STREAM_CHUNK_SIZE = 64 * 1024
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_session() -> requests.Session:
+    """Return the shared keep-alive session used for every source request"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            session.headers.update(HEADERS)
+
+            # One pooled adapter per scheme so concurrent workers reuse connections
+            pool_size = max(config.SCRAPER_MAX_WORKERS, 1)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+    return _session
+
+
+def resolve_url(url: str) -> str:
+    """Map a source URL to where it is actually fetched from (live or replay)"""
+    base_url = get_replay_base_url()
+    return replay_url(base_url, url) if base_url else url
+
+
+def _request_targets(url: str) -> List[str]:
+    """The resolved primary URL followed by its resolved mirrors"""
+    return [resolve_url(target) for target in [url] + MIRRORS.get(url, [])]
+
+
+def get_cache() -> ResponseCache | None:
+    """Return the configured response cache, or None when caching is disabled"""
+    if not config.SCRAPER_CACHE_ENABLED:
+        return None
+    return ResponseCache()
+
+
+def fetch_page_html(url: str, cache: Optional[ResponseCache] = None,
+                    use_cache: bool = True) -> str | None:
+    """
+    Fetch CSV content from a single URL, revalidating any cached copy.
+    Uses the configured response cache unless one is passed or `use_cache`
+    is False; a full response is stored with its validators and hash.
+    """
+    if cache is None and use_cache:
+        cache = get_cache()
+    entry = cache.get(url) if cache else None
     try:
-        resp = requests.get(url, timeout=10, headers=HEADERS)
+        headers = cache.conditional_headers(entry) if cache else {}
+        resp = get_policy().get(get_session(), _request_targets(url),
+                                timeout=config.SCRAPER_TIMEOUT, headers=headers)
+        if resp.status_code == 304 and entry:
+            cache.touch(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+            body = cache.load_body(url)
+            if body is not None:
+                return body.decode(resp.encoding or "utf-8")
+            resp = get_policy().get(get_session(), _request_targets(url), timeout=config.SCRAPER_TIMEOUT)
         resp.raise_for_status()
+        if cache:
+            _store_page(cache, url, entry, resp)
         return resp.text
     except requests.RequestException as e:
         print(f"Unable to fetch data from {url}: {e}")
         return None
 
 
-def fetch_from_multiple_sources() -> List[Dict] | None:
+def _store_page(cache: ResponseCache, url: str, entry: Optional[Dict], resp: requests.Response) -> None:
+    """Cache a full response body with its validators and content hash"""
+    etag = resp.headers.get("ETag")
+    last_modified = resp.headers.get("Last-Modified")
+    staging_path, digest = cache.store_body(url, [resp.content])
+    if entry and entry.get("sha256") == digest:
+        # Same body as cached: keep its parsed summary, just refresh the validators
+        cache.discard_body(staging_path)
+        cache.touch(url, etag, last_modified)
+    else:
+        cache.store(url, staging_path, digest, etag, last_modified)
+
+
+def _header_matches(first_chunk: bytes, schema: SourceSchema) -> bool:
+    """Check whether the header line at the start of a body fits a schema"""
+    header_line = first_chunk.split(b"\n", 1)[0].decode("utf-8-sig", errors="replace")
+    header = next(csv.reader([header_line]), [])
+    return schema.compile(header) is not None
+
+
+def _fetch_and_parse(url: str, timeout: float, cache: Optional[ResponseCache] = None,
+                     revalidate: bool = True, give_up_at: Optional[float] = None) -> MajorAggregator:
+    """
+    Fetch a single source and aggregate it as soon as the response arrives.
+
+    The body is streamed rather than loaded whole: with a cache it is
+    spooled to disk while being hashed and then parsed from the file
+    (sharded across processes when large), otherwise rows are parsed
+    straight off the decoded response stream. Either way rows are folded
+    into a per-source MajorAggregator as they are parsed.
+    Requests go through the shared FetchPolicy (retries, circuit breaker,
+    hedging to mirrors) until `give_up_at`.
+    """
+    name = url.split('/')[-1]
+    schema = get_schema(url)
+    if schema is None:
+        print(f"⚠ {name} carries no income data, skipping")
+        return MajorAggregator()
+
+    entry = cache.get(url) if cache else None
+    headers = cache.conditional_headers(entry) if cache and revalidate else {}
+
+    resp = get_policy().get(get_session(), _request_targets(url), give_up_at=give_up_at,
+                            timeout=timeout, headers=headers, stream=True)
+    with resp:
+        if resp.status_code == 304 and entry:
+            summary = cache.load_summary(url, PARSER_VERSION)
+            if summary is not None:
+                cache.touch(url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                print(f"✓ {name} not modified, reusing {summary['records']} cached records")
+                return MajorAggregator.from_dict(summary)
+            # Validators matched but the cached summary is unusable; fetch in full
+            return _fetch_and_parse(url, timeout, cache, revalidate=False, give_up_at=give_up_at)
+
+        resp.raise_for_status()
+        print(f"✓ Successfully fetched from {name}")
+
+        if not cache:
+            # A text stream keeps line endings, so csv sees quoted fields spanning lines
+            resp.raw.decode_content = True
+            # Otherwise urllib3 reports itself closed at EOF and the wrapper raises
+            resp.raw.auto_close = False
+            body = io.TextIOWrapper(resp.raw, encoding="utf-8-sig", errors="replace", newline="")
+            return MajorAggregator().add_jobs(iter_job_data_csv(body, schema))
+
+        # Check the header in the first chunk before spooling the rest
+        chunks = resp.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+        first_chunk = next(chunks, b"")
+        if not _header_matches(first_chunk, schema):
+            print(f"⚠ {name} header does not match {schema}, skipping")
+            return MajorAggregator()
+
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        staging_path, digest = cache.store_body(url, itertools.chain([first_chunk], chunks))
+
+    if entry and entry.get("sha256") == digest:
+        summary = cache.load_summary(url, PARSER_VERSION)
+        if summary is not None:
+            cache.discard_body(staging_path)
+            cache.touch(url, etag, last_modified)
+            print(f"✓ {name} unchanged, reusing {summary['records']} cached records")
+            return MajorAggregator.from_dict(summary)
+
+    try:
+        aggregator = parse_file_parallel(str(staging_path), schema)
+    except Exception:
+        cache.discard_body(staging_path)
+        raise
+    cache.store(url, staging_path, digest, etag, last_modified, aggregator.to_dict(), PARSER_VERSION)
+    return aggregator
+
+
+def fetch_from_multiple_sources(sources: Optional[List[str]] = None,
+                                max_workers: Optional[int] = None,
+                                deadline: Optional[float] = None,
+                                use_cache: bool = True,
+                                scheduler: Optional[SourceScheduler] = None) -> List[Dict] | None:
     """
     Attempts to fetch data from multiple sources and combines them.
     Automatically handles duplicate majors by averaging their incomes.
+
+    Sources are fetched concurrently by a SourceScheduler sharing one
+    pooled session: highest-priority sources start first, per-host
+    concurrency and rate limits are respected, and each response is parsed
+    in its worker as soon as it arrives. `max_workers` caps concurrency
+    (1 fetches sequentially) and `deadline` bounds the whole run in
+    seconds; sources still pending are dropped. Pass a `scheduler` to
+    reuse one and inspect its stats afterwards.
+    With `use_cache`, unchanged sources are revalidated with conditional
+    GETs and their previously parsed summaries are reused. Each source is
+    reduced to a MajorAggregator and the partials are merged at the end.
     """
-    all_jobs = []
-    
-    for url in ALL_SOURCES:
-        try:
-            resp = requests.get(url, timeout=10, headers=HEADERS)
-            resp.raise_for_status()
-            print(f"✓ Successfully fetched from {url.split('/')[-1]}")
-            
-            # Try to parse as CSV
-            jobs = parse_job_data_csv(resp.text)
-            all_jobs.extend(jobs)
-            
-        except requests.RequestException as e:
-            print(f"⚠ Failed to fetch from {url}: {e}")
-            continue
-    
-    if not all_jobs:
+    if sources is None:
+        sources = ALL_SOURCES
+    if deadline is None:
+        deadline = config.SCRAPER_DEADLINE
+    if scheduler is None:
+        scheduler = SourceScheduler(max_workers=max_workers)
+    cache = get_cache() if use_cache else None
+
+    policy = get_policy()
+    policy.reset_metrics()
+
+    combined = MajorAggregator()
+    started = time.monotonic()
+    give_up_at = started + deadline
+
+    def fetch(url: str) -> MajorAggregator:
+        timeout = max(min(config.SCRAPER_TIMEOUT, give_up_at - time.monotonic()), 0.1)
+        return _fetch_and_parse(url, timeout, cache, give_up_at=give_up_at)
+
+    for url in sources:
+        scheduler.submit(url)
+
+    for url, aggregator, error in scheduler.run(fetch, deadline=deadline):
+        if error is None:
+            combined.merge(aggregator)
+        elif isinstance(error, requests.RequestException):
+            print(f"⚠ Failed to fetch from {url}: {error}")
+        else:
+            raise error
+
+    metrics = policy.summary()
+    if metrics["attempts"]:
+        p95 = f"{metrics['p95']:.2f}s" if metrics["p95"] is not None else "n/a"
+        print(f"✓ Fetch attempts: {metrics['attempts']} ({metrics['retries']} retries, "
+              f"{metrics['hedged']} hedged), outcomes {metrics['outcomes']}, p95 {p95}")
+
+    if not combined.records:
         print("✗ Failed to fetch from all sources")
         return None
-    
-    print(f"✓ Combined data from {len(ALL_SOURCES)} sources: {len(all_jobs)} total records")
-    
+
+    print(f"✓ Combined data from {len(sources)} sources: {combined.records} total records "
+          f"in {time.monotonic() - started:.2f}s")
+
     # Average duplicates
-    unique_jobs = average_duplicate_majors(all_jobs)
+    unique_jobs = combined.finalize()
+    print(f"✓ Averaged {combined.records} jobs to {len(unique_jobs)} unique majors")
     return unique_jobs
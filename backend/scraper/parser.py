@@ -1,7 +1,14 @@
 """Parser for college major income data"""
 import re
+import io
+import csv
 import json
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+from .schemas import SourceSchema, DEFAULT_SCHEMA
+from .aggregator import MajorAggregator
+
+# Bump whenever parsing output changes so cached rows are re-parsed
+PARSER_VERSION = 4
 
 
 def parse_income_value(raw_str: str) -> int | None:
@@ -30,68 +37,74 @@ def parse_income_value(raw_str: str) -> int | None:
     return None
 
 
-def parse_job_data_csv(csv_content: str) -> list[Dict]:
-    """Parse CSV content and extract Major/Income data"""
-    majors: List[Dict] = []
-    
-    lines = csv_content.strip().split('\n')
-    if not lines:
-        return majors
-    
-    # Column indices based on FiveThirtyEight dataset:
-    # [2]: Major name
-    # [15]: Median salary
-    MAJOR_COL = 2
-    MEDIAN_COL = 15
-    
-    # Parse data rows (skip header at line 0)
-    for line in lines[1:]:
-        if not line.strip():
+def _decoded_lines(source: Iterable) -> Iterator[str]:
+    """Yield text lines from an iterable of str or bytes lines"""
+    for line in source:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8-sig", errors="replace")
+        yield line
+
+
+def iter_job_data_csv(source: Union[str, Iterable],
+                      schema: Optional[SourceSchema] = None) -> Iterator[Dict]:
+    """
+    Stream Major/Income rows out of CSV data.
+
+    `source` may be the full CSV text, an open file or text stream, or any
+    iterable of lines that keep their line endings (`resp.iter_lines()`
+    strips them, which breaks quoted fields spanning lines). Rows are
+    yielded one at a time, so memory stays flat regardless of the size of
+    the source, and quoted fields containing commas or line breaks are
+    handled by the csv module.
+
+    Column positions come from the header via `schema` (DEFAULT_SCHEMA if
+    omitted); a source whose header does not match yields nothing and the
+    rest of its body is never read.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    if schema is None:
+        schema = DEFAULT_SCHEMA
+
+    reader = csv.reader(_decoded_lines(source))
+
+    header = next(reader, None)
+    extract = schema.compile(header) if header else None
+    if extract is None:
+        print(f"⚠ CSV header does not match {schema}, skipping source")
+        return
+
+    for cols in reader:
+        try:
+            major, median_salary_str = extract(cols)
+        except IndexError:
             continue
-        
-        cols = line.split(',')
-        if len(cols) > MEDIAN_COL:
-            major = cols[MAJOR_COL].strip()
-            median_salary_str = cols[MEDIAN_COL].strip()
-            
-            income_value = parse_income_value(median_salary_str)
-            
-            if major and income_value is not None:
-                majors.append({
-                    'major': major,
-                    'income': income_value
-                })
-    
-    return majors
+
+        major = major.strip()
+        income_value = parse_income_value(median_salary_str)
+
+        if major and income_value is not None:
+            yield {
+                'major': major,
+                'income': income_value
+            }
+
+
+def parse_job_data_csv(csv_content: Union[str, Iterable],
+                       schema: Optional[SourceSchema] = None) -> list[Dict]:
+    """Parse CSV content and extract Major/Income data"""
+    return list(iter_job_data_csv(csv_content, schema))
 
 
-def average_duplicate_majors(jobs: List[Dict]) -> List[Dict]:
+def average_duplicate_majors(jobs: Iterable[Dict]) -> List[Dict]:
     """
     Takes a list of jobs and averages income for duplicate majors.
     Returns a new list with unique majors and averaged income.
     """
-    major_incomes: Dict[str, List[int]] = {}
-    
-    # Group incomes by major name
-    for job in jobs:
-        major = job['major'].strip().upper()  # Normalize
-        income = job['income']
-        
-        if major not in major_incomes:
-            major_incomes[major] = []
-        major_incomes[major].append(income)
-    
-    # Calculate average income for each major
-    averaged_jobs = []
-    for major, incomes in major_incomes.items():
-        avg_income = sum(incomes) / len(incomes)
-        averaged_jobs.append({
-            'major': major,
-            'income': int(round(avg_income)),
-            'count': len(incomes)  # Track how many sources were averaged
-        })
-    
-    print(f"✓ Averaged {len(jobs)} jobs to {len(averaged_jobs)} unique majors")
+    aggregator = MajorAggregator().add_jobs(jobs)
+    averaged_jobs = aggregator.finalize()
+
+    print(f"✓ Averaged {aggregator.records} jobs to {len(averaged_jobs)} unique majors")
     return averaged_jobs
 
 
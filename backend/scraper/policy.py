@@ -0,0 +1,276 @@
+"""Resilient fetch policy: retries, backoff, circuit breaking and hedging"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Deque, Dict, List, Optional
+from urllib.parse import urlsplit
+import requests
+from ..config import config
+
+# Status codes worth retrying (rate limiting and transient server errors)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+# Latency samples kept per host for the hedging percentile
+LATENCY_WINDOW = 200
+MIN_LATENCY_SAMPLES = 20
+
+
+class CircuitOpenError(requests.RequestException):
+    """Raised instead of contacting a host whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After `failure_threshold` consecutive
+    failures a host is skipped for `reset_timeout` seconds, then a single
+    trial request is let through (half-open) to decide whether to close it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._trial_in_flight: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, host: str) -> bool:
+        """Whether a request to `host` may be attempted now"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at < self.reset_timeout:
+                return False
+            if self._trial_in_flight.get(host):
+                return False
+            self._trial_in_flight[host] = True
+            return True
+
+    def record_success(self, host: str) -> None:
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+            self._trial_in_flight.pop(host, None)
+
+    def record_failure(self, host: str) -> None:
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            failed_trial = self._trial_in_flight.pop(host, False)
+            if failed_trial or (host not in self._opened_at and self._failures[host] >= self.failure_threshold):
+                self._opened_at[host] = time.monotonic()
+                print(f"⚠ Circuit opened for {host} after {self._failures[host]} failures")
+
+    def state(self, host: str) -> str:
+        """'closed', 'open' or 'half-open' for a host"""
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return "closed"
+            if time.monotonic() - opened_at < self.reset_timeout:
+                return "open"
+            return "half-open"
+
+
+class FetchPolicy:
+    """
+    Wraps source requests with exponential backoff and full jitter, a
+    per-host CircuitBreaker, and optional hedged requests: when the
+    primary URL has not answered within its host's p95 latency, the same
+    request is sent to a mirror and whichever responds first wins.
+    Every attempt is recorded in `metrics` with its timing and outcome.
+    """
+
+    def __init__(self, retries: Optional[int] = None, backoff_base: Optional[float] = None,
+                 backoff_max: Optional[float] = None, hedge: Optional[bool] = None,
+                 hedge_delay: Optional[float] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        self.retries = config.SCRAPER_RETRIES if retries is None else retries
+        self.backoff_base = config.SCRAPER_BACKOFF_BASE if backoff_base is None else backoff_base
+        self.backoff_max = config.SCRAPER_BACKOFF_MAX if backoff_max is None else backoff_max
+        self.hedge = config.SCRAPER_HEDGE if hedge is None else hedge
+        self.hedge_delay = config.SCRAPER_HEDGE_DELAY if hedge_delay is None else hedge_delay
+        self.breaker = breaker or CircuitBreaker(config.SCRAPER_BREAKER_THRESHOLD,
+                                                 config.SCRAPER_BREAKER_RESET)
+        self.metrics: List[Dict] = []
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._hedge_executor = ThreadPoolExecutor(max_workers=max(config.SCRAPER_MAX_WORKERS, 1) * 2,
+                                                  thread_name_prefix="hedged-fetch")
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff delay before retry `attempt` (1-based)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1))))
+
+    def latency_p95(self, host: str) -> Optional[float]:
+        """95th percentile response latency seen for a host, if enough samples"""
+        with self._lock:
+            samples = sorted(self._latencies.get(host, ()))
+        if len(samples) < MIN_LATENCY_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def _record(self, metric: Dict) -> None:
+        with self._lock:
+            self.metrics.append(metric)
+            if metric["outcome"] == "ok":
+                self._latencies.setdefault(metric["host"], deque(maxlen=LATENCY_WINDOW)).append(metric["elapsed"])
+
+    def _attempt(self, session: requests.Session, url: str, attempt: int, hedged: bool,
+                 **kwargs) -> requests.Response:
+        """One timed request, guarded by the host's circuit breaker"""
+        host = urlsplit(url).netloc
+        metric = {"url": url, "host": host, "attempt": attempt, "hedged": hedged,
+                  "status": None, "outcome": None, "elapsed": 0.0, "error": None}
+
+        if not self.breaker.allow(host):
+            metric["outcome"] = "circuit_open"
+            self._record(metric)
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        started = time.monotonic()
+        try:
+            resp = session.get(url, **kwargs)
+        except requests.RequestException as e:
+            metric.update(outcome="error", elapsed=time.monotonic() - started, error=str(e))
+            self.breaker.record_failure(host)
+            self._record(metric)
+            raise
+
+        metric.update(status=resp.status_code, elapsed=time.monotonic() - started)
+        if resp.status_code in RETRYABLE_STATUSES:
+            metric["outcome"] = "retryable"
+            self.breaker.record_failure(host)
+        else:
+            metric["outcome"] = "ok"
+            self.breaker.record_success(host)
+        self._record(metric)
+        return resp
+
+    def _hedged_attempt(self, session: requests.Session, targets: List[str], attempt: int,
+                        **kwargs) -> requests.Response:
+        """
+        Send to the primary, and to a mirror too if the primary is slower
+        than its p95. While the primary's circuit is open the first mirror
+        takes its place, since that is when a mirror matters most.
+        """
+        primary, mirrors = targets[0], targets[1:]
+        if mirrors and self.breaker.state(urlsplit(primary).netloc) == "open":
+            return self._hedged_attempt(session, mirrors, attempt, **kwargs)
+        if not self.hedge or not mirrors:
+            try:
+                return self._attempt(session, primary, attempt, False, **kwargs)
+            except CircuitOpenError:
+                # Lost the half-open trial to another request
+                if not mirrors:
+                    raise
+                return self._hedged_attempt(session, mirrors, attempt, **kwargs)
+
+        delay = self.latency_p95(urlsplit(primary).netloc) or self.hedge_delay
+        primary_future = self._hedge_executor.submit(self._attempt, session, primary, attempt, False, **kwargs)
+        done, _ = wait({primary_future}, timeout=delay)
+        if done:
+            if isinstance(primary_future.exception(), CircuitOpenError):
+                return self._hedged_attempt(session, mirrors, attempt, **kwargs)
+            # Answered in time; failures are left to the retry loop
+            return primary_future.result()
+
+        mirror_future = self._hedge_executor.submit(self._attempt, session, mirrors[0], attempt, True, **kwargs)
+        pending = {primary_future, mirror_future}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if _usable(future):
+                    other = mirror_future if future is primary_future else primary_future
+                    other.add_done_callback(_close_response)
+                    return future.result()
+
+        # Neither succeeded: report the primary's outcome
+        mirror_future.add_done_callback(_close_response)
+        return primary_future.result()
+
+    def get(self, session: requests.Session, targets: List[str],
+            give_up_at: Optional[float] = None, **kwargs) -> requests.Response:
+        """
+        GET the first of `targets` (the rest are mirrors for hedging and
+        for when its circuit is open),
+        retrying connection errors, timeouts and retryable statuses with
+        backoff until the retries are used up or `give_up_at` (a
+        time.monotonic() deadline) would be passed.
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            retry_reason = None
+            try:
+                resp = self._hedged_attempt(session, targets, attempt, **kwargs)
+                if resp.status_code not in RETRYABLE_STATUSES:
+                    return resp
+                retry_reason = f"HTTP {resp.status_code}"
+                if attempt > self.retries:
+                    return resp
+                resp.close()
+            except CircuitOpenError:
+                raise
+            except requests.RequestException as e:
+                if attempt > self.retries:
+                    raise
+                retry_reason = str(e)
+
+            delay = self.backoff(attempt)
+            if give_up_at is not None and time.monotonic() + delay >= give_up_at:
+                raise requests.RequestException(f"Deadline reached after {attempt} attempts ({retry_reason})")
+            print(f"⚠ Attempt {attempt} for {targets[0].split('/')[-1]} failed ({retry_reason}), "
+                  f"retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+    def summary(self) -> Dict:
+        """Aggregate attempt metrics: counts, outcomes and latency percentiles"""
+        with self._lock:
+            metrics = list(self.metrics)
+        latencies = sorted(m["elapsed"] for m in metrics if m["outcome"] == "ok")
+
+        def percentile(p: float) -> Optional[float]:
+            return latencies[int(p * (len(latencies) - 1))] if latencies else None
+
+        outcomes: Dict[str, int] = {}
+        for m in metrics:
+            outcomes[m["outcome"]] = outcomes.get(m["outcome"], 0) + 1
+        return {
+            "attempts": len(metrics),
+            "retries": sum(1 for m in metrics if m["attempt"] > 1),
+            "hedged": sum(1 for m in metrics if m["hedged"]),
+            "outcomes": outcomes,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+        }
+
+    def reset_metrics(self) -> None:
+        with self._lock:
+            self.metrics = []
+
+
+def _usable(future) -> bool:
+    """Whether a finished hedged attempt produced a successful (or 304) response"""
+    return future.exception() is None and future.result().status_code < 400
+
+
+def _close_response(future) -> None:
+    """Release the connection held by a hedging loser once it finishes"""
+    if future.exception() is None:
+        future.result().close()
+
+
+_policy: Optional[FetchPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_policy() -> FetchPolicy:
+    """Return the shared fetch policy, so breaker state and latency history persist"""
+    global _policy
+    with _policy_lock:
+        if _policy is None:
+            _policy = FetchPolicy()
+    return _policy
@@ -0,0 +1,214 @@
+"""Offline replay of recorded scraper sources through a local HTTP stand-in"""
+import argparse
+import email.utils
+import os
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import urlsplit, unquote
+import requests
+from .sources import ALL_SOURCES, HEADERS
+from ..config import config
+
+# Bytes written per chunk when throttling to a bandwidth limit
+REPLAY_CHUNK_SIZE = 16 * 1024
+
+
+def recording_path(replay_dir: str, url: str) -> Path:
+    """Location of the recorded copy of a source URL: <dir>/<host>/<path>"""
+    parts = urlsplit(url)
+    return Path(replay_dir) / parts.netloc / parts.path.lstrip("/")
+
+
+def replay_url(base_url: str, url: str) -> str:
+    """Rewrite a live source URL to the same recording on a replay server"""
+    parts = urlsplit(url)
+    return f"{base_url.rstrip('/')}/{parts.netloc}{parts.path}"
+
+
+def record_sources(replay_dir: str, sources: Optional[List[str]] = None) -> int:
+    """Download live copies of the sources into a replay directory"""
+    recorded = 0
+    for url in sources or ALL_SOURCES:
+        try:
+            resp = requests.get(url, timeout=30, headers=HEADERS)
+            resp.raise_for_status()
+        except requests.RequestException as e:
+            print(f"⚠ Failed to record {url}: {e}")
+            continue
+        path = recording_path(replay_dir, url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(resp.content)
+        print(f"✓ Recorded {url} -> {path} ({len(resp.content):,} bytes)")
+        recorded += 1
+    return recorded
+
+
+class ReplayServer:
+    """
+    Serves recorded sources from `replay_dir` over local HTTP, with
+    optional injected latency (seconds per request), a bandwidth limit
+    (bytes per second, 0 for unlimited) and a failure rate (fraction of
+    requests answered with 503). ETag / Last-Modified validators are
+    honoured so conditional GETs behave like the live hosts.
+    """
+
+    def __init__(self, replay_dir: str, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, bandwidth: int = 0, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.replay_dir = Path(replay_dir)
+        self.latency = latency
+        self.bandwidth = bandwidth
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _should_fail(self) -> bool:
+        with self._random_lock:
+            return self._random.random() < self.failure_rate
+
+    def _make_handler(self):
+        server = self
+
+        class ReplayHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if server.latency > 0:
+                    time.sleep(server.latency)
+
+                if server.failure_rate > 0 and server._should_fail():
+                    self.send_error(503, "Injected failure")
+                    return
+
+                path = (server.replay_dir / unquote(urlsplit(self.path).path).lstrip("/")).resolve()
+                if server.replay_dir.resolve() not in path.parents or not path.is_file():
+                    self.send_error(404, "No recording for this URL")
+                    return
+
+                stat = path.stat()
+                etag = f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+                last_modified = email.utils.formatdate(stat.st_mtime, usegmt=True)
+                if self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/csv; charset=utf-8")
+                self.send_header("Content-Length", str(stat.st_size))
+                self.send_header("ETag", etag)
+                self.send_header("Last-Modified", last_modified)
+                self.end_headers()
+
+                with open(path, "rb") as f:
+                    while True:
+                        chunk = f.read(REPLAY_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        self.wfile.write(chunk)
+                        if server.bandwidth > 0:
+                            time.sleep(len(chunk) / server.bandwidth)
+
+            def log_message(self, format, *args):
+                pass  # Keep scraper output readable
+
+        return ReplayHandler
+
+    def start(self) -> "ReplayServer":
+        """Serve in a background daemon thread"""
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name="replay-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving and release the socket"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def serve_forever(self) -> None:
+        """Serve in the foreground until interrupted"""
+        self._httpd.serve_forever()
+
+    def __enter__(self) -> "ReplayServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+_replay_server: Optional[ReplayServer] = None
+_replay_lock = threading.Lock()
+
+
+def get_replay_base_url() -> Optional[str]:
+    """
+    Return the base URL sources should be replayed from, if replay is on.
+
+    SCRAPER_REPLAY_URL points at an already running replay server;
+    otherwise SCRAPER_REPLAY_DIR starts one in-process on first use with
+    the configured latency, bandwidth and failure rate.
+    """
+    global _replay_server
+    if config.SCRAPER_REPLAY_URL:
+        return config.SCRAPER_REPLAY_URL
+    if not config.SCRAPER_REPLAY_DIR:
+        return None
+    with _replay_lock:
+        if _replay_server is None:
+            _replay_server = ReplayServer(
+                config.SCRAPER_REPLAY_DIR,
+                latency=config.SCRAPER_REPLAY_LATENCY,
+                bandwidth=config.SCRAPER_REPLAY_BANDWIDTH,
+                failure_rate=config.SCRAPER_REPLAY_FAILURE_RATE,
+            ).start()
+            print(f"✓ Replaying sources from {config.SCRAPER_REPLAY_DIR} at {_replay_server.base_url}")
+    return _replay_server.base_url
+
+
+def main(argv: Optional[List[str]] = None) -> bool:
+    """Command line entry point: record or serve a replay directory"""
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    subparsers = arg_parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record", help="download live sources")
+    record_parser.add_argument("replay_dir")
+
+    serve_parser = subparsers.add_parser("serve", help="serve recorded sources")
+    serve_parser.add_argument("replay_dir")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+    serve_parser.add_argument("--bandwidth", type=int, default=0, help="bytes per second (0 = unlimited)")
+    serve_parser.add_argument("--failure-rate", type=float, default=0.0, help="fraction of 503 responses")
+    serve_parser.add_argument("--seed", type=int, default=None)
+
+    args = arg_parser.parse_args(argv)
+    if args.command == "record":
+        return record_sources(args.replay_dir) > 0
+
+    server = ReplayServer(args.replay_dir, host=args.host, port=args.port, latency=args.latency,
+                          bandwidth=args.bandwidth, failure_rate=args.failure_rate, seed=args.seed)
+    print(f"Replaying {os.path.abspath(args.replay_dir)} at {server.base_url}")
+    print(f"Set SCRAPER_REPLAY_URL={server.base_url} to scrape against it")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return True
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,166 @@
+"""Priority scheduler for source fetches with per-host limits"""
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlsplit
+from .sources import SOURCE_PRIORITIES, DEFAULT_PRIORITY, HOST_LIMITS
+from ..config import config
+
+
+class SourceScheduler:
+    """
+    Runs source fetches on a fixed set of worker threads, always starting
+    the highest-priority queued source (lowest number) whose host has a
+    free concurrency slot and is within its request-rate limit. Lower
+    priority sources fill whatever capacity is left over.
+
+    A scheduler is reusable: queue sources with `submit`, then iterate
+    `run(fetch)` to get (url, result, error) tuples as fetches complete.
+    `stats()` reports queue depth, in-flight work and queue wait times.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 host_concurrency: Optional[int] = None,
+                 host_rate: Optional[float] = None):
+        self.max_workers = config.SCRAPER_MAX_WORKERS if max_workers is None else max_workers
+        self.host_concurrency = (config.SCRAPER_HOST_CONCURRENCY
+                                 if host_concurrency is None else host_concurrency)
+        self.host_rate = config.SCRAPER_HOST_RATE if host_rate is None else host_rate
+
+        self._queue: List[Tuple[int, int, str, float]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight: Dict[str, int] = {}
+        self._next_start: Dict[str, float] = {}
+        self._waits: List[float] = []
+        self._completed = 0
+        # Bumped by each run and on its deadline; workers of older runs exit
+        self._generation = 0
+
+    def limits_for(self, host: str) -> Tuple[int, float]:
+        """(max concurrent requests, max requests per second) for a host"""
+        concurrency, rate = HOST_LIMITS.get(host, (self.host_concurrency, self.host_rate))
+        return max(concurrency, 1), rate
+
+    def submit(self, url: str, priority: Optional[int] = None) -> None:
+        """Queue a source; lower priority numbers are fetched first"""
+        if priority is None:
+            priority = SOURCE_PRIORITIES.get(url, DEFAULT_PRIORITY)
+        with self._cond:
+            heapq.heappush(self._queue, (priority, next(self._seq), url, time.monotonic()))
+            self._cond.notify_all()
+
+    def _take(self, generation: int) -> Optional[Tuple[int, int, str, float]]:
+        """Block until a queued source may start; None once drained or the run is over"""
+        with self._cond:
+            while True:
+                if generation != self._generation or not self._queue:
+                    return None
+
+                now = time.monotonic()
+                wake_at = None
+                for task in sorted(self._queue):
+                    host = urlsplit(task[2]).netloc
+                    concurrency, rate = self.limits_for(host)
+                    if self._in_flight.get(host, 0) >= concurrency:
+                        continue
+                    start_at = self._next_start.get(host, 0.0)
+                    if start_at > now:
+                        wake_at = start_at if wake_at is None else min(wake_at, start_at)
+                        continue
+
+                    self._queue.remove(task)
+                    heapq.heapify(self._queue)
+                    self._in_flight[host] = self._in_flight.get(host, 0) + 1
+                    if rate > 0:
+                        self._next_start[host] = now + 1.0 / rate
+                    self._waits.append(now - task[3])
+                    return task
+
+                # Everything queued is blocked by a host limit
+                self._cond.wait(timeout=None if wake_at is None else wake_at - now)
+
+    def _release(self, url: str) -> None:
+        with self._cond:
+            host = urlsplit(url).netloc
+            self._in_flight[host] -= 1
+            self._completed += 1
+            self._cond.notify_all()
+
+    def _end_run(self, generation: int) -> None:
+        """Stop the workers of run `generation` from taking further sources"""
+        with self._cond:
+            if self._generation == generation:
+                self._generation += 1
+                self._cond.notify_all()
+
+    def _worker(self, fetch: Callable[[str], Any], results: queue.Queue, generation: int) -> None:
+        while True:
+            task = self._take(generation)
+            if task is None:
+                return
+            url = task[2]
+            try:
+                results.put((url, fetch(url), None))
+            except Exception as e:
+                results.put((url, None, e))
+            finally:
+                self._release(url)
+
+    def run(self, fetch: Callable[[str], Any],
+            deadline: Optional[float] = None) -> Iterator[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Fetch every queued source with `fetch(url)`, yielding
+        (url, result, error) as each finishes. If `deadline` seconds pass
+        first, sources not yet started are dropped and in-flight ones are
+        abandoned (they finish on daemon threads).
+        """
+        with self._cond:
+            total = len(self._queue)
+            self._generation += 1
+            generation = self._generation
+            # Any workers still blocked from an abandoned run see the new generation
+            self._cond.notify_all()
+        if total == 0:
+            return
+
+        # Each run gets its own result queue, so late results from an
+        # abandoned run never land in this one
+        results: queue.Queue = queue.Queue()
+        for i in range(min(max(self.max_workers, 1), total)):
+            threading.Thread(target=self._worker, args=(fetch, results, generation),
+                             name=f"source-fetch-{i}", daemon=True).start()
+
+        started = time.monotonic()
+        try:
+            for _ in range(total):
+                timeout = None if deadline is None else max(deadline - (time.monotonic() - started), 0.0)
+                try:
+                    yield results.get(timeout=timeout)
+                except queue.Empty:
+                    with self._cond:
+                        dropped = len(self._queue)
+                        self._queue = []
+                    self._end_run(generation)
+                    print(f"⚠ Deadline of {deadline}s reached, dropping {dropped} queued sources "
+                          f"and {self.stats()['in_flight']} in flight")
+                    return
+        finally:
+            self._end_run(generation)
+
+    def stats(self) -> Dict:
+        """Queue depth, in-flight count and queue wait times so far"""
+        with self._cond:
+            waits = list(self._waits)
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": sum(self._in_flight.values()),
+                "in_flight_by_host": {host: n for host, n in self._in_flight.items() if n},
+                "completed": self._completed,
+                "started": len(waits),
+                "avg_wait": sum(waits) / len(waits) if waits else 0.0,
+                "max_wait": max(waits) if waits else 0.0,
+            }
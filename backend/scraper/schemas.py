@@ -0,0 +1,49 @@
+"""Per-source column schemas for college major income data"""
+import operator
+from typing import Callable, Dict, List, Optional, Tuple
+from .sources import BASE_URL, ALTERNATE_SOURCES
+
+# Extractor returned by SourceSchema.compile: row -> (major, raw income)
+RowExtractor = Callable[[List[str]], Tuple[str, str]]
+
+
+class SourceSchema:
+    """Names the header columns holding the major and its median income"""
+
+    def __init__(self, major_column: str = "Major", income_column: str = "Median"):
+        self.major_column = major_column
+        self.income_column = income_column
+
+    def compile(self, header: List[str]) -> Optional[RowExtractor]:
+        """
+        Resolve column positions from a header row once and build an
+        extractor specialised for that layout. Returns None if the header
+        does not carry the expected columns.
+        """
+        positions = {name.strip().lstrip("\ufeff").lower(): i for i, name in enumerate(header)}
+        major_idx = positions.get(self.major_column.lower())
+        income_idx = positions.get(self.income_column.lower())
+        if major_idx is None or income_idx is None:
+            return None
+        return operator.itemgetter(major_idx, income_idx)
+
+    def __repr__(self) -> str:
+        return f"SourceSchema(major_column={self.major_column!r}, income_column={self.income_column!r})"
+
+
+# FiveThirtyEight recent-grads layout (also mirrored by TidyTuesday)
+RECENT_GRADS_SCHEMA = SourceSchema(major_column="Major", income_column="Median")
+
+DEFAULT_SCHEMA = RECENT_GRADS_SCHEMA
+
+# Known sources; None marks a source that carries no income data at all
+SOURCE_SCHEMAS: Dict[str, Optional[SourceSchema]] = {
+    BASE_URL: RECENT_GRADS_SCHEMA,
+    ALTERNATE_SOURCES[0]: None,  # majors-list.csv: names and categories only
+    ALTERNATE_SOURCES[1]: RECENT_GRADS_SCHEMA,
+}
+
+
+def get_schema(url: str) -> Optional[SourceSchema]:
+    """Return the schema for a source URL, falling back to DEFAULT_SCHEMA"""
+    return SOURCE_SCHEMAS.get(url, DEFAULT_SCHEMA)
@@ -12,3 +12,27 @@ HEADERS = {
 }
 
 ALL_SOURCES = [BASE_URL] + ALTERNATE_SOURCES
+
+# Fetch order for the scheduler: lower numbers go first
+DEFAULT_PRIORITY = 10
+SOURCE_PRIORITIES = {
+    BASE_URL: 0,
+    ALTERNATE_SOURCES[1]: 5,
+    ALTERNATE_SOURCES[0]: 20,
+}
+
+# Per-host (max concurrent requests, max requests per second); 0 means no rate limit.
+# Hosts not listed use SCRAPER_HOST_CONCURRENCY / SCRAPER_HOST_RATE.
+HOST_LIMITS = {
+    "raw.githubusercontent.com": (4, 10.0),
+}
+
+# Mirrors of the same files, used for hedged requests when a primary is slow
+MIRRORS = {
+    BASE_URL: [
+        "https://cdn.jsdelivr.net/gh/fivethirtyeight/data@master/college-majors/recent-grads.csv"
+    ],
+    ALTERNATE_SOURCES[1]: [
+        "https://cdn.jsdelivr.net/gh/rfordatascience/tidytuesday@master/data/2018/2018-10-16/recent-grads.csv"
+    ],
+}
@@ -0,0 +1,6 @@
+"""Small dependency-free helpers shared by the scraper and the API"""
+
+
+def normalize_major(major: str) -> str:
+    """Normalize a major name so duplicates across sources line up"""
+    return major.strip().upper()
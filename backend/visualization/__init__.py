@@ -1,4 +1,16 @@
 """Visualization package for plotting data"""
-from .plotter import Plotter
+from .render import (
+    render_income_chart, RenderService, get_render_service,
+    RenderError, RenderBusy, RenderTimeout,
+)
 
-__all__ = ['Plotter']
+__all__ = ['Plotter', 'render_income_chart', 'RenderService', 'get_render_service',
+           'RenderError', 'RenderBusy', 'RenderTimeout']
+
+
+def __getattr__(name):
+    # Plotter pulls in matplotlib.pyplot; load it only when asked for
+    if name == 'Plotter':
+        from .plotter import Plotter
+        return Plotter
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
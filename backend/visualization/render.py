@@ -0,0 +1,204 @@
+"""Plot rendering in a worker process pool, without pyplot global state"""
+import io
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+from ..config import config
+
+
+class RenderError(RuntimeError):
+    """Base class for render service failures"""
+
+
+class RenderBusy(RenderError):
+    """Raised when the render queue is full (backpressure)"""
+
+
+class RenderTimeout(RenderError):
+    """Raised when a render does not finish within its timeout"""
+
+
+def render_income_chart(majors: List[str], incomes: List[int], width: float = 14.0,
+                        height: float = 10.0, dpi: int = 100, fmt: str = "png") -> bytes:
+    """
+    Render the income-by-major bar chart to PNG or SVG bytes.
+
+    Uses a standalone Figure on an Agg canvas, so it holds no global
+    pyplot state and is safe to call from any thread or process.
+    """
+    # Imported here so only render workers pay for loading matplotlib
+    import matplotlib
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.ticker import FuncFormatter
+
+    fig = Figure(figsize=(width, height))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.barh(majors, incomes, color='steelblue')
+    ax.set_xlabel('Median Income ($)', fontsize=12)
+    ax.set_ylabel('Major', fontsize=12)
+    ax.set_title('College Majors by Income', fontsize=14, fontweight='bold')
+    ax.invert_yaxis()  # Highest income at top
+
+    # Format x-axis as currency
+    ax.xaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x:,.0f}'))
+    fig.tight_layout()
+
+    img = io.BytesIO()
+    if fmt == "svg":
+        # Fixed ids and no date keep the SVG bytes (and so the ETag) stable
+        with matplotlib.rc_context({"svg.hashsalt": "income-by-major"}):
+            fig.savefig(img, format='svg', bbox_inches='tight', metadata={"Date": None})
+    else:
+        fig.savefig(img, format='png', dpi=dpi, bbox_inches='tight')
+    return img.getvalue()
+
+
+class RenderService:
+    """
+    Runs render_income_chart on a ProcessPoolExecutor so renders use all
+    cores and never block or share state with request threads.
+
+    At most `max_pending` renders may be queued or running; beyond that
+    `render` waits up to `queue_timeout` seconds for a slot and then
+    raises RenderBusy. Each render must finish within `timeout` seconds
+    or RenderTimeout is raised and the pool is recycled: its workers are
+    terminated (freeing their slots) and the next render starts a fresh
+    pool. Renders caught in a recycle are retried once.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_pending: Optional[int] = None,
+                 timeout: Optional[float] = None, queue_timeout: Optional[float] = None):
+        self.workers = max(config.RENDER_WORKERS if workers is None else workers, 1)
+        self.max_pending = max(config.RENDER_MAX_PENDING if max_pending is None else max_pending, 1)
+        self.timeout = config.RENDER_TIMEOUT if timeout is None else timeout
+        self.queue_timeout = config.RENDER_QUEUE_TIMEOUT if queue_timeout is None else queue_timeout
+
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the API process runs request threads
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _submit(self, *args):
+        """Submit a render; returns the executor used and the future"""
+        executor = self._get_executor()
+        try:
+            return executor, executor.submit(render_income_chart, *args)
+        except BrokenProcessPool:
+            # A worker died and took the pool with it: start a fresh one
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            executor = self._get_executor()
+            return executor, executor.submit(render_income_chart, *args)
+
+    def _recycle(self, executor: ProcessPoolExecutor) -> None:
+        """Kill `executor`'s workers (if still current) so hung renders free their slots"""
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+        # Pending futures fail with BrokenProcessPool once their workers are gone,
+        # which runs their done callbacks and releases the slots
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        executor.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            process.terminate()
+
+    def render(self, majors: List[str], incomes: List[int], width: float = 14.0,
+               height: float = 10.0, dpi: int = 100, fmt: str = "png") -> bytes:
+        """Render in a worker process, applying backpressure and the timeout"""
+        args = (majors, incomes, width, height, dpi, fmt)
+        try:
+            return self._render_once(args)
+        except BrokenProcessPool:
+            # The pool was recycled after another render timed out: retry once on a fresh one
+            try:
+                return self._render_once(args)
+            except BrokenProcessPool as e:
+                raise RenderError(f"Render workers failed: {e}") from None
+
+    def _render_once(self, args) -> bytes:
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self.rejected += 1
+            raise RenderBusy(f"Render queue full ({self.max_pending} pending)")
+
+        with self._lock:
+            self._pending += 1
+        try:
+            executor, future = self._submit(*args)
+        except BaseException:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            image = future.result(timeout=self.timeout)
+        except FutureTimeout:
+            with self._lock:
+                self.timeouts += 1
+            self._recycle(executor)
+            raise RenderTimeout(f"Render did not finish within {self.timeout}s") from None
+        with self._lock:
+            self.completed += 1
+        return image
+
+    def warm(self, workers: int = 1) -> None:
+        """Start up to `workers` worker processes and load matplotlib in each"""
+        executor = self._get_executor()
+        # Spawned pools start workers on demand, one per concurrent submission
+        futures = [executor.submit(render_income_chart, ["warmup"], [1], 2.0, 2.0, 50)
+                   for _ in range(min(max(workers, 1), self.workers))]
+        for future in futures:
+            future.result(timeout=self.timeout)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+            }
+
+
+_render_service: Optional[RenderService] = None
+_render_service_lock = threading.Lock()
+
+
+def get_render_service() -> RenderService:
+    """Return the shared render service, creating its pool on first use"""
+    global _render_service
+    with _render_service_lock:
+        if _render_service is None:
+            _render_service = RenderService()
+    return _render_service
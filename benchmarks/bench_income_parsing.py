@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""Benchmark scalar vs columnar income parsing (rows/sec)"""
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from backend.scraper import parse_income_value
+from backend.scraper.columnar import parse_income_column
+
+
+def make_column(rows: int, odd_ratio: float, seed: int = 0) -> list[str]:
+    """Build a salary column that is mostly plain digits with some odd formats"""
+    rng = random.Random(seed)
+    odd_formats = [
+        lambda v: f"{v // 1000}k",
+        lambda v: f"${v:,}",
+        lambda v: f"{v:,} to {v + 24999:,}",
+        lambda v: "",
+    ]
+    column = []
+    for _ in range(rows):
+        value = rng.randint(20, 120) * 1000
+        if rng.random() < odd_ratio:
+            column.append(rng.choice(odd_formats)(value))
+        else:
+            column.append(str(value))
+    return column
+
+
+def best_of(repeats: int, func, *args) -> float:
+    """Return the fastest wall-clock time of several runs"""
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        func(*args)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def scalar_parse(column: list[str]) -> list[int | None]:
+    return [parse_income_value(value) for value in column]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__)
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    arg_parser.add_argument("--odd-ratio", type=float, default=0.01,
+                            help="fraction of values that need the slow path")
+    arg_parser.add_argument("--repeats", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    column = make_column(args.rows, args.odd_ratio)
+
+    # Both paths must agree before timing them
+    expected = scalar_parse(column)
+    incomes, valid = parse_income_column(column)
+    actual = [int(v) if ok else None for v, ok in zip(incomes, valid)]
+    if actual != expected:
+        print("✗ Columnar results differ from parse_income_value")
+        return False
+
+    scalar_time = best_of(args.repeats, scalar_parse, column)
+    columnar_time = best_of(args.repeats, parse_income_column, column)
+
+    print(f"Rows: {args.rows:,} (odd formats: {args.odd_ratio:.1%})")
+    print(f"Scalar   parse_income_value: {args.rows / scalar_time:>14,.0f} rows/sec")
+    print(f"Columnar parse_income_column: {args.rows / columnar_time:>13,.0f} rows/sec")
+    print(f"Speedup: {scalar_time / columnar_time:.1f}x")
+    return True
+
+
+if __name__ == "__main__":
+    success = main()
+    sys.exit(0 if success else 1)
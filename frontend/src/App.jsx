@@ -20,9 +20,9 @@ function App() {
       const statsResponse = await axios.get('/api/statistics');
       setStats(statsResponse.data);
 
-      // Fetch plot
-      const plotResponse = await axios.get('/api/plot');
-      setPlot(plotResponse.data.image);
+      // Fetch plot metadata; the browser loads (and caches) the image itself
+      const plotResponse = await axios.get('/api/plot/meta');
+      setPlot(plotResponse.data.url);
     } catch (err) {
       setError(err.message || 'Failed to fetch data');
       console.error('Error fetching data:', err);
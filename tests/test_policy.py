@@ -0,0 +1,126 @@
+"""Circuit breaker state transitions and FetchPolicy failover"""
+import pytest
+
+from backend.scraper import policy
+from backend.scraper.policy import CircuitBreaker, CircuitOpenError, FetchPolicy
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(policy.time, "monotonic", fake)
+    return fake
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    def close(self):
+        pass
+
+
+class FakeSession:
+    """Answers each host with a fixed status code and records the URLs requested"""
+
+    def __init__(self, statuses):
+        self.statuses = statuses
+        self.requested = []
+
+    def get(self, url, **kwargs):
+        self.requested.append(url)
+        return FakeResponse(self.statuses[url])
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=60)
+    for _ in range(2):
+        breaker.record_failure("a")
+    assert breaker.state("a") == "closed"
+    assert breaker.allow("a")
+
+    breaker.record_failure("a")
+    assert breaker.state("a") == "open"
+    assert not breaker.allow("a")
+    assert breaker.state("b") == "closed"
+
+
+def test_success_resets_consecutive_failures(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    breaker.record_failure("a")
+    breaker.record_success("a")
+    breaker.record_failure("a")
+    assert breaker.state("a") == "closed"
+
+
+def test_half_open_allows_a_single_trial(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("a")
+    clock.now += 61
+    assert breaker.state("a") == "half-open"
+    assert breaker.allow("a")
+    assert not breaker.allow("a")
+
+
+def test_successful_trial_closes_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("a")
+    clock.now += 61
+    assert breaker.allow("a")
+    breaker.record_success("a")
+    assert breaker.state("a") == "closed"
+    assert breaker.allow("a")
+
+
+def test_failed_trial_reopens_the_circuit(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("a")
+    clock.now += 61
+    assert breaker.allow("a")
+    breaker.record_failure("a")
+    assert breaker.state("a") == "open"
+    clock.now += 30
+    assert not breaker.allow("a")
+
+
+def _policy(breaker, hedge=False, retries=0):
+    return FetchPolicy(retries=retries, backoff_base=0, backoff_max=0, hedge=hedge, breaker=breaker)
+
+
+@pytest.mark.parametrize("hedge", [False, True])
+def test_open_primary_fails_over_to_mirror(clock, hedge):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("primary")
+    session = FakeSession({"http://mirror/x.csv": 200})
+
+    resp = _policy(breaker, hedge).get(session, ["http://primary/x.csv", "http://mirror/x.csv"])
+    assert resp.status_code == 200
+    assert session.requested == ["http://mirror/x.csv"]
+
+
+def test_open_primary_without_mirror_raises(clock):
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    breaker.record_failure("primary")
+    fetch_policy = _policy(breaker)
+    with pytest.raises(CircuitOpenError):
+        fetch_policy.get(FakeSession({}), ["http://primary/x.csv"])
+    assert fetch_policy.summary()["outcomes"] == {"circuit_open": 1}
+
+
+def test_retryable_statuses_trip_the_breaker(clock):
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    session = FakeSession({"http://primary/x.csv": 503})
+    fetch_policy = _policy(breaker, retries=3)
+
+    with pytest.raises(CircuitOpenError):
+        fetch_policy.get(session, ["http://primary/x.csv"])
+    assert len(session.requested) == 2
+    assert breaker.state("primary") == "open"
@@ -0,0 +1,114 @@
+"""Connection lifecycle tests for the SQLite storage engine"""
+import os
+import threading
+
+import pytest
+
+from backend.database.sqlite_db import SQLiteDatabase
+
+JOBS = [{"major": "ART", "income": 40000}, {"major": "COMPUTER SCIENCE", "income": 90000}]
+
+
+@pytest.fixture
+def db(tmp_path):
+    database = SQLiteDatabase(str(tmp_path / "income.db"), busy_timeout=0.2, pool_size=2)
+    database.sync_majors(JOBS)
+    yield database
+    database.close()
+
+
+def _run_in_threads(target, count):
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def _open_fds():
+    return len(os.listdir("/proc/self/fd"))
+
+
+def test_connections_are_reused_across_threads(db):
+    # One short-lived thread per request, as the threaded Flask server does
+    for _ in range(50):
+        _run_in_threads(db.get_statistics, 1)
+    assert db._opened == 1
+
+    _run_in_threads(lambda: [db.get_top_n_majors(2) for _ in range(20)], 8)
+    assert db._opened <= db.pool_size
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_requests_do_not_leak_file_descriptors(db):
+    db.get_statistics()
+    before = _open_fds()
+    for _ in range(100):
+        _run_in_threads(lambda: list(db.iter_all_majors()), 1)
+    assert _open_fds() == before
+
+
+def test_close_releases_every_connection(db):
+    _run_in_threads(lambda: [db.get_top_n_majors(2) for _ in range(20)], 4)
+    db.close()
+    assert db._opened == 0
+    with db.connection() as conn:
+        assert conn is None
+
+
+def test_connection_checked_out_at_close_is_closed_on_return(db):
+    with db.connection() as conn:
+        db.close()
+    assert db._opened == 0
+    with pytest.raises(Exception):
+        conn.execute("SELECT 1")
+
+
+def test_abandoned_stream_returns_its_connection(db):
+    stream = db.iter_all_majors(batch_size=1)
+    assert len(next(stream)) == 1
+    assert db._idle.qsize() == 0
+    stream.close()
+    assert db._idle.qsize() == 1
+
+
+def test_exhausted_pool_yields_none_after_busy_timeout(db):
+    held = [db.iter_all_majors(batch_size=1) for _ in range(db.pool_size)]
+    for stream in held:
+        next(stream)
+    with db.connection() as conn:
+        assert conn is None
+    for stream in held:
+        stream.close()
+    with db.connection() as conn:
+        assert conn is not None
+
+
+def test_memory_database_is_shared_by_all_threads():
+    db = SQLiteDatabase(":memory:", pool_size=4)
+    db.sync_majors(JOBS)
+    totals = []
+    _run_in_threads(lambda: totals.append(db.get_statistics()["total_majors"]), 3)
+    assert totals == [2, 2, 2]
+    assert db.pool_size == 1
+    db.close()
+
+
+def test_schema_is_applied_once(tmp_path):
+    path = str(tmp_path / "income.db")
+    SQLiteDatabase(path).close()
+    db = SQLiteDatabase(path)
+    db.sync_majors(JOBS)
+    # Reopening must not re-seed or reset the summary row
+    version = db.get_statistics()["data_version"]
+    db.close()
+    reopened = SQLiteDatabase(path)
+    assert reopened.get_statistics()["data_version"] == version
+    assert reopened.get_statistics()["total_majors"] == 2
+    reopened.close()
+
+
+def test_unchanged_sync_keeps_data_version(db):
+    version = db.get_statistics()["data_version"]
+    assert db.sync_majors(JOBS)["unchanged"] == 2
+    assert db.get_statistics()["data_version"] == version